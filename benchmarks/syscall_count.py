@@ -0,0 +1,155 @@
+"""
+Count the metadata system calls (stat, lstat, fstat, DirEntry.stat) the engines make per file.
+
+The os functions are wrapped with counters for the duration of each scenario,
+so no strace is needed and the script runs the same on Windows. Each step
+is measured twice: with plain paths, where every step stats the files again,
+and with the FileStat records captured by FileFilter.iter_entries.
+
+Usage:
+    python benchmarks/syscall_count.py [number_of_files]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.assets.file_filter import FileFilter, ignores_case
+from src.assets.naming_rules import get_cleaner
+from src.assets.subfolder_file_rename import iter_rename_plan, find_and_rename_files
+from src.assets.dedup import find_duplicates
+from src.assets.io_throttle import order_for_locality
+from src.assets.folder_copy import copy_and_rename_files
+
+COUNTS = Counter()
+
+
+class _CountingEntry:
+    """DirEntry proxy counting the first stat() call (later calls hit DirEntry's cache)"""
+
+    def __init__(self, entry):
+        self._entry = entry
+        self._stat_counted = False
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def stat(self, follow_symlinks=True):
+        if not self._stat_counted:
+            self._stat_counted = True
+            COUNTS["DirEntry.stat"] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _CountingScandir:
+    def __init__(self, iterator):
+        self._iterator = iterator
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._iterator.close()
+
+    def __iter__(self):
+        for entry in self._iterator:
+            yield _CountingEntry(entry)
+
+
+def _counted(name, func):
+    def wrapper(*args, **kwargs):
+        COUNTS[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class count_syscalls:
+    """Context manager patching os.stat/lstat/fstat/scandir with counting wrappers"""
+
+    def __enter__(self):
+        COUNTS.clear()
+        self.originals = {name: getattr(os, name) for name in ("stat", "lstat", "fstat", "scandir")}
+        os.stat = _counted("stat", self.originals["stat"])
+        os.lstat = _counted("lstat", self.originals["lstat"])
+        os.fstat = _counted("fstat", self.originals["fstat"])
+        scandir = _counted("scandir", self.originals["scandir"])
+        os.scandir = lambda path=".": _CountingScandir(scandir(path))
+        return COUNTS
+
+    def __exit__(self, *exc):
+        for name, func in self.originals.items():
+            setattr(os, name, func)
+
+
+def make_tree(root, count):
+    """count files in 20 folders, names needing a rename, every 10th file a duplicate"""
+    for i in range(count):
+        folder = os.path.join(root, f"Folder {i % 20}")
+        os.makedirs(folder, exist_ok=True)
+        content = b"duplicate" if i % 10 == 0 else f"file {i}".encode()
+        with open(os.path.join(folder, f"My File {i}.txt"), "wb") as f:
+            f.write(content)
+
+
+def report(title, counts, files):
+    total = sum(value for key, value in counts.items() if key != "scandir")
+    details = ", ".join(f"{key}={value}" for key, value in sorted(counts.items()))
+    print(f"{title:<48} {total:>8} calls  {total / files:5.2f}/file  ({details})")
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = tempfile.mkdtemp()
+    output = tempfile.mkdtemp()
+    try:
+        source = os.path.join(root, "Source")
+        make_tree(source, files)
+        file_filter = FileFilter(extensions=None)
+        cleaner = get_cleaner()
+        print(f"{files} files\n")
+
+        with count_syscalls() as counts:
+            list(iter_rename_plan(file_filter.iter_files(source), cleaner))
+        report("rename plan, plain paths", counts, files)
+
+        with count_syscalls() as counts:
+            listings = {}
+            list(iter_rename_plan(file_filter.iter_files(source, listings=listings), cleaner,
+                                  listings=listings, ignore_case=ignores_case(source)))
+        report("rename plan, folder listings", counts, files)
+        print()
+
+        with count_syscalls() as counts:
+            paths = [str(path) for path in file_filter.iter_files(source)]
+            for path in paths:
+                os.path.getsize(path)
+            find_duplicates(paths, None)
+            order_for_locality(paths, by_inode=True)
+        report("copy prep (size, dedup, inode order), paths", counts, files)
+
+        with count_syscalls() as counts:
+            stats = {str(path): stat for path, stat in file_filter.iter_entries(source)}
+            find_duplicates(list(stats), None, stats=stats)
+            order_for_locality(list(stats), by_inode=True, stats=stats)
+        report("copy prep (size, dedup, inode order), records", counts, files)
+        print()
+
+        with count_syscalls() as counts, contextlib.redirect_stdout(io.StringIO()):
+            find_and_rename_files(source, None, dry_run=False)
+        report("full rename run", counts, files)
+
+        with count_syscalls() as counts:
+            copy_and_rename_files(source, output, dedup="skip", hash_cache_path=None, order="inode")
+        report("full copy run (incl. shutil.copy2)", counts, files)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(output, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,10 +16,23 @@ a = Analysis(
         'PyQt5.QtWidgets',
         'src.assets.subfolder_file_rename',
         'src.assets.text_symbol_replace',
+        'src.assets.naming_rules',
+        'src.assets.transliterate',
+        'src.assets.filename_guard',
+        'src.assets.folder_copy',
+        'src.assets.dedup',
+        'src.assets.file_filter',
+        'src.assets.error_report',
+        'src.assets.io_throttle',
+        'src.assets.chunked_copy',
+        'src.assets.scan_snapshot',
+        'src.assets.plan_io',
+        'src.assets.archive_rename',
         'src.uiitems.close_button',
         'src.uiitems.directory_input',
         'src.uiitems.custom_alert',
         'src.uiitems.dash_line',
+        'src.uiitems.preview_table',
     ],
     hookspath=[],
     hooksconfig={},
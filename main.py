@@ -1,7 +1,5 @@
 import sys
 import os
-import shutil
-from pathlib import Path
 from PyQt5.QtWidgets import (
     QApplication,
     QWidget,
@@ -10,14 +8,43 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QLabel,
     QProgressBar,
+    QFileDialog,
+    QComboBox,
+    QLineEdit,
+    QSpinBox,
+    QCheckBox,
 )
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QPixmap
-from src.assets.text_symbol_replace import clean_text_to_underscore
+from src.assets.naming_rules import get_cleaner, NamingProfileError
+from src.assets.folder_copy import copy_and_rename_files, iter_copy_plan
+from src.assets.file_filter import FileFilter, DEFAULT_EXCLUDES, parse_patterns
 from src.uiitems.close_button import CloseButton
 from src.uiitems.directory_input import DirectoryInput
 from src.uiitems.custom_alert import CustomAlert
 from src.uiitems.dash_line import DashedLine
+from src.uiitems.preview_table import PreviewPane
+
+
+def format_bytes(size):
+    """Human readable byte count, e.g. 1536 -> '1.5 KB'"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def summarize_errors(result):
+    """Short error report for the completion alert: count per category with one example file each"""
+    lines = [f"{result['errors']} files had errors:"]
+    examples = {}
+    for record in result["details"]["errors"]:
+        examples.setdefault(record["category"], record)
+    for category, count in sorted(result["error_counts"].items(), key=lambda item: -item[1]):
+        record = examples[category]
+        lines.append(f"{category} ({count}), e.g. {os.path.basename(record['path'])}: {record['message']}")
+    return "\n".join(lines)
 
 
 class MainWorkflowApp(QWidget):
@@ -26,6 +53,8 @@ class MainWorkflowApp(QWidget):
         self.init_ui()
         self.input_directory = ""
         self.output_directory = ""
+        self.naming_profile = None
+        self.preview_pane = None
         self.setMouseTracking(True)
         self.oldPos = self.pos()
 
@@ -108,6 +137,44 @@ class MainWorkflowApp(QWidget):
         self.output_directory_input.directorySelected.connect(self.on_output_directory_selected)
         layout.addWidget(self.output_directory_input)
 
+        # Optional naming profile (.toml/.json rules); default rules when not set
+        profile_row = QHBoxLayout()
+        self.profile_button = self.create_button("Naming Profile: Default", self.select_naming_profile)
+        profile_row.addWidget(self.profile_button, 1)
+        self.reset_profile_button = self.create_button("Default", self.reset_naming_profile)
+        self.reset_profile_button.setToolTip("Go back to the default naming rules")
+        self.reset_profile_button.setEnabled(False)
+        profile_row.addWidget(self.reset_profile_button)
+        layout.addLayout(profile_row)
+
+        # What to do with byte-identical files in the output
+        self.dedup_combo = QComboBox(self)
+        self.dedup_combo.addItem("Duplicates: Copy All", None)
+        self.dedup_combo.addItem("Duplicates: Skip", "skip")
+        self.dedup_combo.addItem("Duplicates: Hardlink", "hardlink")
+        self.dedup_combo.setStyleSheet("""
+            QComboBox {
+                background-color: #CDEBF0;
+                color: black;
+                font-weight: bold;
+                border: none;
+                border-radius: 8px;
+                padding: 10px;
+                margin: 10px;
+            }
+        """)
+        layout.addWidget(self.dedup_combo)
+
+        # Files and folders to leave out (comma separated globs); excluded folders are not scanned
+        self.exclude_input = QLineEdit(self)
+        self.exclude_input.setPlaceholderText("Exclude patterns, e.g. .git, node_modules, *.tmp")
+        self.exclude_input.setText(", ".join(DEFAULT_EXCLUDES))
+        self.exclude_input.setToolTip("Comma separated file/folder patterns to skip")
+        layout.addWidget(self.exclude_input)
+
+        # Copy throughput settings: parallel copies, adaptive back-off and bandwidth/IOPS caps (0 = unlimited)
+        layout.addLayout(self.create_throughput_settings())
+
         # Add dashed line separator
         dash_line_2 = DashedLine(color='#CDEBF0', orientation='horizontal')
         layout.addWidget(dash_line_2)
@@ -117,6 +184,11 @@ class MainWorkflowApp(QWidget):
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
 
+        # Preview of the planned names, filled lazily as the table is scrolled
+        self.preview_button = self.create_button("Preview Names", self.show_preview)
+        self.preview_button.setEnabled(False)
+        layout.addWidget(self.preview_button)
+
         # Submit button with black background and blue border
         self.submit_button = self.create_button("Start Cooking", self.process_files)
         self.submit_button.setEnabled(False)
@@ -151,6 +223,40 @@ class MainWorkflowApp(QWidget):
         title_bar.addWidget(close_button, alignment=Qt.AlignRight)
         return title_bar
 
+    def create_throughput_settings(self):
+        settings = QHBoxLayout()
+        settings.setContentsMargins(10, 0, 10, 0)
+
+        self.workers_spin = QSpinBox(self)
+        self.workers_spin.setRange(1, 32)
+        self.workers_spin.setValue(4)
+        self.workers_spin.setToolTip("Maximum number of files copied in parallel")
+
+        self.adaptive_check = QCheckBox("Adaptive", self)
+        self.adaptive_check.setChecked(True)
+        self.adaptive_check.setToolTip("Copy fewer files in parallel when the storage slows down")
+
+        self.bandwidth_spin = QSpinBox(self)
+        self.bandwidth_spin.setRange(0, 100000)
+        self.bandwidth_spin.setSuffix(" MB/s")
+        self.bandwidth_spin.setSpecialValueText("No MB/s limit")
+        self.bandwidth_spin.setToolTip("Maximum copy bandwidth, 0 for unlimited")
+
+        self.iops_spin = QSpinBox(self)
+        self.iops_spin.setRange(0, 100000)
+        self.iops_spin.setSuffix(" files/s")
+        self.iops_spin.setSpecialValueText("No files/s limit")
+        self.iops_spin.setToolTip("Maximum files started per second, 0 for unlimited")
+
+        self.verify_check = QCheckBox("Verify copies", self)
+        self.verify_check.setToolTip("Compute a SHA-256 checksum while copying and re-read each copy to check it")
+
+        for widget in (QLabel("Workers", self), self.workers_spin, self.adaptive_check,
+                       self.bandwidth_spin, self.iops_spin, self.verify_check):
+            widget.setStyleSheet("border: none; padding: 4px;")
+            settings.addWidget(widget)
+        return settings
+
     def create_logo_label(self):
         logo = QLabel(self)
         # Get the base path for the application
@@ -174,11 +280,6 @@ class MainWorkflowApp(QWidget):
         logo.setAlignment(Qt.AlignCenter)
         return logo
 
-    def log_message(self, message):
-        """Add a message to the log text area"""
-        self.log_text.append(message)
-        self.log_text.ensureCursorVisible()
-
     def create_button(self, text, slot, style=None):
         button = QPushButton(text, self)
         button.clicked.connect(slot)
@@ -211,12 +312,62 @@ class MainWorkflowApp(QWidget):
         self.output_directory = directory_path
         self.update_submit_button_state()
 
+    def select_naming_profile(self):
+        """Pick a .toml/.json naming profile; cancelling keeps the current one"""
+        profile_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Naming Profile", "", "Naming Profiles (*.toml *.json)"
+        )
+        if not profile_path:
+            return
+
+        try:
+            get_cleaner(profile_path)  # Validate and compile up front
+        except NamingProfileError as e:
+            alert = CustomAlert(self, f"Invalid naming profile: {str(e)}", is_error=True)
+            alert.show()
+            return
+
+        self.naming_profile = profile_path
+        self.profile_button.setText(f"Naming Profile: {os.path.basename(profile_path)}")
+        self.reset_profile_button.setEnabled(True)
+
+    def reset_naming_profile(self):
+        """Go back to the default naming rules"""
+        self.naming_profile = None
+        self.profile_button.setText("Naming Profile: Default")
+        self.reset_profile_button.setEnabled(False)
+
     def update_submit_button_state(self):
         """Enable/disable submit button based on directory selection"""
         if self.input_directory and self.output_directory:
             self.submit_button.setEnabled(True)
+            self.preview_button.setEnabled(True)
         else:
             self.submit_button.setEnabled(False)
+            self.preview_button.setEnabled(False)
+
+    def current_file_filter(self):
+        """File filter built from the exclude patterns field"""
+        return FileFilter(extensions=None, exclude=parse_patterns(self.exclude_input.text()))
+
+    def show_preview(self):
+        """Open the preview window with the streaming copy plan for the current settings"""
+        try:
+            plan = iter_copy_plan(
+                self.input_directory,
+                self.output_directory,
+                naming_profile=self.naming_profile,
+                file_filter=self.current_file_filter(),
+            )
+        except Exception as e:
+            alert = CustomAlert(self, f"Could not build preview: {str(e)}", is_error=True)
+            alert.show()
+            return
+
+        if self.preview_pane is not None:
+            self.preview_pane.close()
+        self.preview_pane = PreviewPane(plan)
+        self.preview_pane.show()
 
     def process_files(self):
         """Process files from input to output directory"""
@@ -228,74 +379,51 @@ class MainWorkflowApp(QWidget):
         try:
             # Show progress bar
             self.progress_bar.setVisible(True)
+            self.progress_bar.setMaximum(1000)
             self.progress_bar.setValue(0)
+            self.progress_bar.setFormat("%p%")
             self.submit_button.setEnabled(False)
+            verify = self.verify_check.isChecked()
             
-            # Get all files from input directory
-            input_path = Path(self.input_directory)
-            files_to_process = []
+            result = copy_and_rename_files(
+                self.input_directory,
+                self.output_directory,
+                naming_profile=self.naming_profile,
+                dedup=self.dedup_combo.currentData(),
+                progress_callback=self.update_progress,
+                byte_progress_callback=self.update_byte_progress,
+                scan_callback=self.update_scan_progress,
+                file_filter=self.current_file_filter(),
+                max_workers=self.workers_spin.value(),
+                adaptive=self.adaptive_check.isChecked(),
+                bandwidth_limit=self.bandwidth_spin.value() * 1024 * 1024 or None,
+                iops_limit=self.iops_spin.value() or None,
+                checksum="sha256" if verify else None,
+                verify=verify,
+            )
             
-            # Find all files recursively
-            for file_path in input_path.rglob("*"):
-                if file_path.is_file():
-                    files_to_process.append(file_path)
+            # Hide progress bar
+            self.progress_bar.setVisible(False)
             
-            if not files_to_process:
+            if result["total_files"] == 0 and result["errors"] == 0:
                 alert = CustomAlert(self, "No files found in the input directory.", is_error=True)
                 alert.show()
-                self.progress_bar.setVisible(False)
-                self.submit_button.setEnabled(True)
                 return
             
-            self.progress_bar.setMaximum(len(files_to_process))
-            
-            processed_count = 0
-            error_count = 0
-            
-            for i, file_path in enumerate(files_to_process):
-                try:
-                    # Get relative path from input directory
-                    relative_path = file_path.relative_to(input_path)
-                    
-                    # Clean the filename using our function
-                    original_name = file_path.stem
-                    file_extension = file_path.suffix
-                    cleaned_name = clean_text_to_underscore(original_name)
-                    
-                    # Create new filename
-                    new_filename = f"{cleaned_name}{file_extension}"
-                    
-                    # Create output path maintaining directory structure
-                    output_path = Path(self.output_directory) / relative_path.parent
-                    output_path.mkdir(parents=True, exist_ok=True)
-                    
-                    # Final output file path
-                    final_output_path = output_path / new_filename
-                    
-                    # Copy file to output directory with cleaned name
-                    shutil.copy2(file_path, final_output_path)
-                    
-                    processed_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    if error_count == 1:  # Show first error
-                        alert = CustomAlert(self, f"Error processing {file_path.name}: {str(e)}", is_error=True)
-                        alert.show()
-                
-                # Update progress
-                self.progress_bar.setValue(i + 1)
-                QApplication.processEvents()  # Keep UI responsive
-            
-            # Hide progress bar
-            self.progress_bar.setVisible(False)
-            
             # Show completion message
-            if error_count == 0:
-                alert = CustomAlert(self, f"Successfully processed {processed_count} files!", is_error=False)
+            message = f"Successfully processed {result['copied']} files!"
+            if verify:
+                message += "\nCopies verified with SHA-256."
+            if result["duplicates"]:
+                message += f"\n{result['duplicates']} duplicates {'hardlinked' if self.dedup_combo.currentData() == 'hardlink' else 'skipped'}, saving {format_bytes(result['saved_bytes'])}."
+            if result["skipped"]:
+                message += f"\n{result['skipped']} files skipped (name already used)."
+            if result["errors"] == 0:
+                alert = CustomAlert(self, message, is_error=False)
                 alert.show()
             else:
-                alert = CustomAlert(self, f"Processed {processed_count} files successfully.\n{error_count} files had errors.", is_error=True)
+                # One report for the whole run, grouped by error category
+                alert = CustomAlert(self, f"{message}\n{summarize_errors(result)}", is_error=True)
                 alert.show()
             
         except Exception as e:
@@ -306,6 +434,25 @@ class MainWorkflowApp(QWidget):
         finally:
             self.submit_button.setEnabled(True)
 
+    def update_progress(self, done, total):
+        """File progress callback for the copy engine; shown as the bar's text"""
+        self.progress_bar.setFormat(f"%p% ({done}/{total} files)")
+        QApplication.processEvents()  # Keep UI responsive
+
+    def update_scan_progress(self, stage, done, total):
+        """Walk and duplicate-hashing callback; keeps the window responsive before copying starts"""
+        if stage == "scan":
+            self.progress_bar.setFormat(f"Scanning... {done} files found")
+        else:
+            self.progress_bar.setFormat(f"Looking for duplicates... {done}/{total} files")
+            self.progress_bar.setValue(int(done * 1000 / total) if total else 1000)
+        QApplication.processEvents()
+
+    def update_byte_progress(self, done_bytes, total_bytes):
+        """Byte progress callback for the copy engine; moves smoothly through large files"""
+        self.progress_bar.setValue(int(done_bytes * 1000 / total_bytes) if total_bytes else 1000)
+        QApplication.processEvents()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.oldPos = event.globalPos()
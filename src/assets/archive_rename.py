@@ -0,0 +1,302 @@
+import os
+import posixpath
+import shutil
+import tarfile
+import zipfile
+from pathlib import PurePosixPath
+from src.assets.naming_rules import get_cleaner
+from src.assets.filename_guard import MAX_NAME_BYTES
+from src.assets.file_filter import FileFilter
+from src.assets.subfolder_file_rename import iter_rename_plan
+from src.assets.error_report import ErrorCollector
+
+# Archive suffixes and the tarfile compression they imply ("" for a plain tar)
+TAR_SUFFIXES = {
+    ".tar": "",
+    ".tar.gz": "gz", ".tgz": "gz",
+    ".tar.bz2": "bz2", ".tbz2": "bz2",
+    ".tar.xz": "xz", ".txz": "xz",
+}
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def archive_kind(path):
+    """
+    Recognize an archive by its name.
+
+    Args:
+        path (str): Archive path
+
+    Returns:
+        tuple: ("zip", None), ("tar", compression) or None if not a supported archive
+    """
+    name = os.path.basename(str(path)).lower()
+    if name.endswith(".zip"):
+        return ("zip", None)
+    for suffix in sorted(TAR_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return ("tar", TAR_SUFFIXES[suffix])
+    return None
+
+
+def _archive_suffix(path):
+    name = os.path.basename(str(path)).lower()
+    for suffix in sorted([".zip", *TAR_SUFFIXES], key=len, reverse=True):
+        if name.endswith(suffix):
+            return str(path)[len(str(path)) - len(suffix):]
+    return ""
+
+
+def default_output_path(source_archive):
+    """bundle.tar.gz -> bundle_renamed.tar.gz, next to the source"""
+    suffix = _archive_suffix(source_archive)
+    return str(source_archive)[:len(str(source_archive)) - len(suffix)] + "_renamed" + suffix
+
+
+def plan_member_renames(member_names, cleaner, file_filter=None, max_name_bytes=MAX_NAME_BYTES):
+    """
+    Plan new names for archive members with the same rules and collision checks as folders.
+
+    Every member name (and every folder implied by one) is known up front, so a
+    member is only renamed to a name no other member has and no other rename
+    claims - exactly like iter_rename_plan with a complete folder listing.
+
+    Args:
+        member_names (list): Names of the regular file members, "/" separated
+        cleaner (callable): Function turning a stem into a cleaned stem
+        file_filter (FileFilter): Which members to rename; None renames every file member
+        max_name_bytes (int): Maximum length of a filename in UTF-8 bytes
+
+    Returns:
+        tuple: (plan entries from iter_rename_plan, {old member name: new member name})
+    """
+    listings = {}
+    for name in member_names:
+        path = PurePosixPath(name)
+        # Register the member in its folder and each implied folder in its parent
+        for parent, child in zip(path.parents, (path, *path.parents)):
+            listings.setdefault(str(parent), set()).add(child.name)
+
+    candidates = []
+    original_by_path = {}
+    for name in member_names:
+        path = PurePosixPath(name)
+        if file_filter is not None:
+            relative = str(path)
+            if not file_filter.matches_file(path.name, relative) or any(
+                    file_filter.is_excluded(parent.name, str(parent)) for parent in path.parents if parent.name):
+                continue
+        candidates.append(path)
+        original_by_path[str(path)] = name
+
+    plan = list(iter_rename_plan(candidates, cleaner, max_name_bytes, listings=listings))
+    renames = {}
+    for entry in plan:
+        if entry["status"] == "rename":
+            original = original_by_path[entry["original"]]
+            # Swap only the last component so prefixes like "./" are kept as they were
+            base = original[:len(original) - len(PurePosixPath(original).name)]
+            renames[original] = base + posixpath.basename(entry["new"])
+    return plan, renames
+
+
+def _copy_zip(source_archive, output_archive, cleaner, file_filter, max_name_bytes, dry_run):
+    with zipfile.ZipFile(source_archive) as zin:
+        infos = zin.infolist()
+        files = [info.filename for info in infos if not info.is_dir()]
+        plan, renames = plan_member_renames(files, cleaner, file_filter, max_name_bytes)
+        if dry_run or not renames:
+            return plan, renames
+        if any(info.flag_bits & 0x1 for info in infos):
+            raise ValueError("Encrypted zip members can't be rewritten")
+
+        with zipfile.ZipFile(output_archive, "w") as zout:
+            zout.comment = zin.comment
+            for info in infos:
+                new_info = zipfile.ZipInfo(renames.get(info.filename, info.filename), info.date_time)
+                new_info.compress_type = info.compress_type
+                new_info.external_attr = info.external_attr
+                new_info.create_system = info.create_system
+                new_info.comment = info.comment
+                # Lets the writer decide on ZIP64 before the data arrives
+                new_info.file_size = info.file_size
+                if info.is_dir():
+                    zout.writestr(new_info, b"")
+                    continue
+                with zin.open(info) as member, zout.open(new_info, "w") as target:
+                    shutil.copyfileobj(member, target, COPY_BUFFER_SIZE)
+    return plan, renames
+
+
+def _copy_tar(source_archive, output_archive, compression, cleaner, file_filter, max_name_bytes, dry_run):
+    with tarfile.open(source_archive, "r:*") as tin:
+        # Headers first: collision checks need every name before the first member is written
+        members = tin.getmembers()
+        plan, renames = plan_member_renames(
+            [member.name for member in members if member.isreg()], cleaner, file_filter, max_name_bytes
+        )
+        if dry_run or not renames:
+            return plan, renames
+
+        # Link targets may be spelled with or without "./"
+        normalized_renames = {posixpath.normpath(name): new for name, new in renames.items()}
+        with tarfile.open(output_archive, "w:" + compression, format=tin.format) as tout:
+            for member in members:
+                new_member = tarfile.TarInfo(renames.get(member.name, member.name))
+                for attribute in ("size", "mtime", "mode", "type", "linkname", "uid", "gid", "uname", "gname",
+                                  "devmajor", "devminor"):
+                    setattr(new_member, attribute, getattr(member, attribute))
+                # A stored path in the pax header would override the new name
+                new_member.pax_headers = {
+                    key: value for key, value in member.pax_headers.items() if key not in ("path", "linkpath")
+                }
+                if member.islnk():
+                    # Hard links point at another member by name
+                    new_member.linkname = normalized_renames.get(posixpath.normpath(member.linkname), member.linkname)
+                elif member.issym() and not member.linkname.startswith("/"):
+                    # Keep relative symlinks pointing at their (renamed) target
+                    target = posixpath.normpath(posixpath.join(posixpath.dirname(member.name), member.linkname))
+                    if target in normalized_renames:
+                        new_member.linkname = posixpath.relpath(
+                            normalized_renames[target], posixpath.dirname(new_member.name) or "."
+                        )
+                if member.isreg():
+                    tout.addfile(new_member, tin.extractfile(member))
+                else:
+                    tout.addfile(new_member)
+    return plan, renames
+
+
+def rename_archive_members(source_archive, output_archive=None, naming_profile=None, dry_run=True,
+                           file_filter=None, max_name_bytes=MAX_NAME_BYTES, in_place=False):
+    """
+    Clean the member names of a .zip or .tar(.gz/.bz2/.xz) archive without extracting it.
+
+    Members are streamed from the source archive straight into a new archive
+    under their cleaned names; nothing is written to disk besides the new
+    archive. Names are planned with iter_rename_plan against the complete
+    member list, so a rename never takes a name another member already has.
+    Folders inside the archive keep their names, like find_and_rename_files.
+    Data is decompressed and recompressed with the member's own method (zip)
+    or the archive's compression (tar). Compressed tars are read twice, once
+    for the member headers and once for the data. An archive with nothing to
+    rename is left alone: no new archive is written and "output" is None.
+
+    Args:
+        source_archive (str): Archive to read
+        output_archive (str): Archive to write; defaults to "<name>_renamed.<ext>" next to it
+        naming_profile: Naming rules to apply (see naming_rules.get_cleaner)
+        dry_run (bool): If True, only plan and show the renames
+        file_filter (FileFilter): Which members to rename; None renames every file member
+        max_name_bytes (int): Maximum length of a member's filename in UTF-8 bytes
+        in_place (bool): Replace source_archive with the rewritten archive (ignores output_archive)
+
+    Returns:
+        dict: Summary of operations performed
+    """
+    kind = archive_kind(source_archive)
+    if kind is None:
+        raise ValueError(f"Unsupported archive type: {source_archive}")
+    if in_place:
+        output_archive = str(source_archive) + ".renaming" + _archive_suffix(source_archive)
+    elif output_archive is None:
+        output_archive = default_output_path(source_archive)
+    if os.path.abspath(output_archive) == os.path.abspath(source_archive):
+        raise ValueError("output_archive must differ from source_archive (use in_place=True)")
+
+    cleaner = get_cleaner(naming_profile)
+    errors = ErrorCollector(verbose=False)
+    plan, renames = [], {}
+    written = None
+    try:
+        if kind[0] == "zip":
+            plan, renames = _copy_zip(source_archive, output_archive, cleaner, file_filter, max_name_bytes, dry_run)
+        else:
+            plan, renames = _copy_tar(source_archive, output_archive, kind[1], cleaner, file_filter,
+                                      max_name_bytes, dry_run)
+        if not dry_run and renames:
+            if in_place:
+                os.replace(output_archive, source_archive)
+                output_archive = str(source_archive)
+            written = str(output_archive)
+    except Exception as e:
+        errors.add(source_archive, e, "archive")
+        # Don't leave a half-written archive behind
+        if not dry_run and written is None and os.path.exists(output_archive):
+            os.remove(output_archive)
+        renames = {}
+
+    skipped_files = [
+        {"path": entry["original"], "reason": entry["reason"]}
+        for entry in plan if entry["status"] in ("unchanged", "collision")
+    ]
+    for entry in plan:
+        if entry["status"] == "error":
+            errors.add(f"{source_archive}:{entry['original']}", entry["reason"], "plan", entry.get("errno"))
+
+    for original, new in renames.items():
+        print(f"{'WOULD RENAME' if dry_run else 'RENAMED'}: {source_archive}:{original} -> {new}")
+
+    return {
+        "archive": str(source_archive),
+        "output": written,
+        "total_files": len(plan),
+        "renamed": len(renames),
+        "skipped": len(skipped_files),
+        "fallbacks": sum(1 for entry in plan if entry["status"] == "rename" and entry["fallback"]),
+        "errors": len(errors),
+        "error_counts": dict(errors.counts),
+        "error_report": errors.report(),
+        "details": {
+            "renamed_files": [{"original": original, "new": new} for original, new in renames.items()],
+            "skipped_files": skipped_files,
+            "errors": errors.to_list()
+        }
+    }
+
+
+def find_and_rename_archives(root_folder, dry_run=True, recursive=True, naming_profile=None,
+                             include=None, exclude=None, member_filter=None):
+    """
+    Clean the member names of every archive found in a folder, replacing each archive in place.
+
+    The counterpart of find_and_rename_files for bundles: instead of extracting,
+    renaming and repacking, each archive is rewritten once by rename_archive_members.
+
+    Args:
+        root_folder (str): Root folder path to search
+        dry_run (bool): If True, only show what would be renamed
+        recursive (bool): If True, search subfolders recursively
+        naming_profile: Naming rules to apply (see naming_rules.get_cleaner)
+        include (list): Glob patterns archives must match
+        exclude (list): Glob patterns for archives and folders to skip
+        member_filter (FileFilter): Which members to rename; None renames every file member
+
+    Returns:
+        dict: Summary of operations performed, with one summary per archive in "archives"
+              and the folders the walk couldn't read in "scan_errors"
+    """
+    archive_filter = FileFilter([".zip", *TAR_SUFFIXES], include=include, exclude=exclude)
+    scan_errors = ErrorCollector(verbose=False)
+    archives = []
+    totals = {"total_files": 0, "renamed": 0, "skipped": 0, "fallbacks": 0, "errors": 0}
+    for archive_path in archive_filter.iter_files(root_folder, recursive, errors=scan_errors):
+        if archive_kind(archive_path) is None:
+            continue
+        result = rename_archive_members(archive_path, naming_profile=naming_profile, dry_run=dry_run,
+                                        file_filter=member_filter, in_place=True)
+        if result["error_report"]:
+            print(result["error_report"])
+        archives.append(result)
+        for key in totals:
+            totals[key] += result[key]
+    totals["errors"] += len(scan_errors)
+    if scan_errors:
+        print(scan_errors.report())
+
+    print(f"\nArchives processed: {len(archives)}")
+    print(f"Members {'would be ' if dry_run else ''}renamed: {totals['renamed']}")
+    print(f"Members skipped: {totals['skipped']}")
+    print(f"Errors: {totals['errors']}")
+    return dict(totals, archives=archives, scan_errors=scan_errors.to_list())
@@ -0,0 +1,144 @@
+import hashlib
+import mmap
+import os
+import shutil
+
+# 8 MiB: a multiple of every common page size, large enough that per-chunk
+# Python overhead is negligible next to the I/O
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+class ChecksumMismatchError(OSError):
+    """Raised when a verified copy does not match the source checksum."""
+
+
+def _aligned_buffer(size):
+    # An anonymous mapping is page-aligned, unlike a bytearray
+    return mmap.mmap(-1, size)
+
+
+def _write_all(f, chunk):
+    # Unbuffered writes may be partial
+    written = 0
+    while written < len(chunk):
+        written += f.write(chunk[written:])
+
+
+def file_checksum(path, algorithm="sha256", buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Checksum of a file, read in large chunks.
+
+    Args:
+        path (str): File to hash
+        algorithm (str): Any hashlib algorithm name
+        buffer_size (int): Read size
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.new(algorithm)
+    buffer = _aligned_buffer(buffer_size)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+    finally:
+        view.release()
+        buffer.close()
+    return digest.hexdigest()
+
+
+def copy_file_chunked(source, destination, buffer_size=DEFAULT_BUFFER_SIZE, use_mmap=False,
+                      checksum=None, verify=False, progress=None, limiter=None):
+    """
+    Copy a file in large chunks, hashing it on the way and reporting progress in bytes.
+
+    The checksum is computed from the same buffers that are written, so the
+    source is read only once. Metadata (times, permissions) is copied like
+    shutil.copy2. If the copy fails or doesn't verify, the destination is
+    deleted so no partial or corrupt file is left behind.
+
+    Args:
+        source (str): File to copy
+        destination (str): Target file path
+        buffer_size (int): Chunk size in bytes
+        use_mmap (bool): Read the source through a memory map instead of read() calls
+        checksum (str): hashlib algorithm to compute during the copy, or None
+        verify (bool): Re-read the destination and compare checksums (needs checksum,
+                       defaults to sha256 when not given)
+        progress (callable): Called with the number of bytes written after each chunk
+        limiter (IOLimiter): Bandwidth limiter charged per chunk, or None
+
+    Returns:
+        str: Hex digest of the source, or None when no checksum was requested
+    """
+    if verify and not checksum:
+        checksum = "sha256"
+    digest = hashlib.new(checksum) if checksum else None
+
+    with open(source, "rb", buffering=0) as src:
+        try:
+            source_checksum = _copy_open_file(src, destination, buffer_size, use_mmap, digest, progress, limiter)
+            shutil.copystat(source, destination)
+            if verify:
+                destination_checksum = file_checksum(destination, checksum, buffer_size)
+                if destination_checksum != source_checksum:
+                    raise ChecksumMismatchError(
+                        f"Checksum mismatch after copy: {source} ({source_checksum}) -> "
+                        f"{destination} ({destination_checksum})"
+                    )
+        except BaseException:
+            try:
+                os.remove(destination)
+            except OSError:
+                pass
+            raise
+    return source_checksum
+
+
+def _copy_open_file(src, destination, buffer_size, use_mmap, digest, progress, limiter):
+    """Copy loop of copy_file_chunked; returns the hex digest, or None without a checksum"""
+    with open(destination, "wb", buffering=0) as dst:
+        # The file as it is now, not as the walk saw it: it may have grown or shrunk since
+        if use_mmap and os.fstat(src.fileno()).st_size > 0:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(mapped), buffer_size):
+                        # Released even when a write fails, so the mapping can be closed
+                        with view[offset:offset + buffer_size] as chunk:
+                            if limiter:
+                                limiter.acquire_bytes(len(chunk))
+                            _write_all(dst, chunk)
+                            if digest:
+                                digest.update(chunk)
+                            if progress:
+                                progress(len(chunk))
+                finally:
+                    view.release()
+        else:
+            buffer = _aligned_buffer(buffer_size)
+            view = memoryview(buffer)
+            try:
+                while True:
+                    read = src.readinto(buffer)
+                    if not read:
+                        break
+                    with view[:read] as chunk:
+                        if limiter:
+                            limiter.acquire_bytes(read)
+                        _write_all(dst, chunk)
+                        if digest:
+                            digest.update(chunk)
+                        if progress:
+                            progress(read)
+            finally:
+                view.release()
+                buffer.close()
+    return digest.hexdigest() if digest else None
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.assets.error_report import with_retry
+from src.assets.file_filter import file_stat
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Seconds between progress calls
+PROGRESS_INTERVAL = 0.1
+
+DEFAULT_HASH_CACHE = os.path.join(os.path.expanduser("~"), ".namerefiner", "hash_cache.db")
+
+
+class HashCache:
+    """
+    Persistent (path, size, mtime) -> content hash cache backed by SQLite.
+
+    An entry is only reused when size and modification time still match, so
+    edited files are rehashed automatically.
+    """
+
+    def __init__(self, cache_path=DEFAULT_HASH_CACHE):
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(cache_path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT)"
+        )
+        self.pending = []
+
+    def get(self, path, size, mtime_ns):
+        row = self.connection.execute(
+            "SELECT digest FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, size, mtime_ns),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, path, size, mtime_ns, digest):
+        self.pending.append((path, size, mtime_ns, digest))
+
+    def save(self):
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                    self.pending,
+                )
+            self.pending = []
+
+    def close(self):
+        self.save()
+        self.connection.close()
+
+
+def hash_file(path):
+    """
+    Content hash of a file (BLAKE2b, read in 1 MiB chunks).
+
+    hashlib releases the GIL while hashing large buffers, so several files
+    can be hashed in parallel threads.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_duplicates(paths, cache_path=DEFAULT_HASH_CACHE, max_workers=4, errors=None, stats=None,
+                    progress=None):
+    """
+    Find byte-identical files.
+
+    Files are grouped by size first; only files sharing a size with another
+    file are hashed, in parallel, and hashes are reused from the persistent
+    cache when the file's size and mtime are unchanged.
+
+    Args:
+        paths (iterable): File paths (str or Path), in processing order
+        cache_path (str): SQLite hash cache location, or None to disable caching
+        max_workers (int): Number of hashing threads
+        errors (ErrorCollector): Receives files that could not be read; they are
+                                 treated as unique
+        stats (dict): {path (str): FileStat} already captured by the folder walk;
+                      files not in it are stat-ed here
+        progress (callable): Called as progress(done, total) from the calling thread as
+                             candidates are looked up in the cache and hashed
+
+    Returns:
+        dict: Maps each duplicate path (str) to the first path (str) with the same
+              content; files without duplicates are not included
+    """
+    by_size = {}
+    known_stats = stats or {}
+    stats = {}
+    for path in paths:
+        path = str(path)
+        st = known_stats.get(path)
+        if st is None:
+            try:
+                st = file_stat(path)
+            except OSError as e:
+                if errors is not None:
+                    errors.add(path, e, "hash")
+                continue
+        stats[path] = st
+        by_size.setdefault(st.size, []).append(path)
+
+    candidates = [path for group in by_size.values() if len(group) > 1 for path in group]
+    if not candidates:
+        return {}
+
+    cache = HashCache(cache_path) if cache_path else None
+    digests = {}
+    to_hash = []
+    done = 0
+    reported = time.monotonic()
+
+    def report():
+        nonlocal reported
+        if progress and time.monotonic() - reported >= PROGRESS_INTERVAL:
+            progress(done, len(candidates))
+            reported = time.monotonic()
+
+    try:
+        for path in candidates:
+            st = stats[path]
+            cached = cache.get(path, st.size, st.mtime_ns) if cache else None
+            if cached:
+                digests[path] = cached
+                done += 1
+                report()
+            else:
+                to_hash.append(path)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for path, digest in zip(to_hash, executor.map(_hash_or_error, to_hash)):
+                done += 1
+                report()
+                if isinstance(digest, OSError):
+                    if errors is not None:
+                        errors.add(path, digest, "hash")
+                    continue
+                digests[path] = digest
+                if cache:
+                    st = stats[path]
+                    cache.put(path, st.size, st.mtime_ns, digest)
+    finally:
+        if cache:
+            cache.close()
+    if progress:
+        progress(done, len(candidates))
+
+    duplicates = {}
+    first_by_content = {}
+    for path in candidates:
+        digest = digests.get(path)
+        if digest is None:
+            continue
+        key = (stats[path].size, digest)
+        if key in first_by_content:
+            duplicates[path] = first_by_content[key]
+        else:
+            first_by_content[key] = path
+    return duplicates
+
+
+def _hash_or_error(path):
+    try:
+        return with_retry(hash_file, path)
+    except OSError as e:
+        return e
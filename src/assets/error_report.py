@@ -0,0 +1,166 @@
+import errno
+import time
+from collections import namedtuple
+
+# One failure: the file, the OS error number (None for non-OS errors), the
+# step that failed ("plan", "rename", "copy", "link", "hash"...) and the message
+ErrorRecord = namedtuple("ErrorRecord", ["path", "errno", "stage", "message"])
+
+# Errors worth retrying: the file is locked or the share hiccuped
+TRANSIENT_ERRNOS = frozenset(
+    getattr(errno, name) for name in (
+        "EBUSY", "EAGAIN", "EINTR", "ETIMEDOUT", "ECONNRESET", "ECONNABORTED",
+        "ENETRESET", "ESTALE", "ETXTBSY",
+    ) if hasattr(errno, name)
+)
+
+# Windows error codes for the same situations (sharing/lock violations, dropped network paths)
+TRANSIENT_WINERRORS = frozenset([32, 33, 53, 64, 121])
+
+CATEGORIES = {
+    errno.EACCES: "permission",
+    errno.EPERM: "permission",
+    errno.ENOENT: "not_found",
+    errno.ENOSPC: "disk_full",
+    errno.ENAMETOOLONG: "invalid_name",
+    errno.EINVAL: "invalid_name",
+    errno.EEXIST: "exists",
+    errno.EXDEV: "cross_device",
+    errno.EROFS: "read_only",
+}
+if hasattr(errno, "EDQUOT"):
+    CATEGORIES[errno.EDQUOT] = "disk_full"
+
+
+def is_transient(exc):
+    """
+    Check whether an exception is worth retrying.
+
+    Args:
+        exc (Exception): Raised exception
+
+    Returns:
+        bool: True for locked files and network timeouts
+    """
+    if isinstance(exc, (TimeoutError, InterruptedError, BlockingIOError)):
+        return True
+    if isinstance(exc, OSError):
+        return exc.errno in TRANSIENT_ERRNOS or getattr(exc, "winerror", None) in TRANSIENT_WINERRORS
+    return False
+
+
+def categorize(record):
+    """
+    Group an error record for the report.
+
+    Args:
+        record (ErrorRecord): Error to categorize
+
+    Returns:
+        str: Category name, e.g. "permission", "not_found", "busy", "other"
+    """
+    if record.errno in CATEGORIES:
+        return CATEGORIES[record.errno]
+    if record.errno in TRANSIENT_ERRNOS:
+        return "busy"
+    return "other"
+
+
+def with_retry(func, *args, attempts=3, delay=0.2, backoff=2.0, **kwargs):
+    """
+    Call func, retrying transient errors (EBUSY, timeouts...) with exponential backoff.
+
+    Args:
+        func (callable): Operation to run, e.g. shutil.copy2
+        attempts (int): Maximum number of tries
+        delay (float): Seconds to wait before the first retry
+        backoff (float): Multiplier applied to the delay after each retry
+
+    Returns:
+        Whatever func returns; the last exception is raised if every attempt fails
+    """
+    for attempt in range(attempts):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_transient(e):
+                raise
+            time.sleep(delay)
+            delay *= backoff
+
+
+class ErrorCollector:
+    """
+    Collects error records during a run without stalling or flooding it.
+
+    Recording an error is a tuple append. Only the first max_records errors
+    per category are kept (the rest are just counted), and only the first
+    print_limit per category are printed, so a share that fails thousands
+    of files produces one short report at the end of the run.
+    """
+
+    def __init__(self, max_records=1000, print_limit=5, verbose=True):
+        self.max_records = max_records
+        self.print_limit = print_limit
+        self.verbose = verbose
+        self.records = {}
+        self.counts = {}
+        self.total = 0
+
+    def add(self, path, exc, stage, error_number=None):
+        """
+        Record a failure.
+
+        Args:
+            path (str): File the error concerns
+            exc (Exception or str): The error
+            stage (str): Step that failed
+            error_number (int): errno to record when exc is a message rather than an exception
+        """
+        if error_number is None:
+            error_number = getattr(exc, "errno", None)
+        record = ErrorRecord(str(path), error_number, stage, str(exc))
+        category = categorize(record)
+        count = self.counts.get(category, 0) + 1
+        self.counts[category] = count
+        self.total += 1
+        if count <= self.max_records:
+            self.records.setdefault(category, []).append(record)
+        if self.verbose:
+            if count <= self.print_limit:
+                print(f"ERROR [{stage}] {record.path}: {record.message}")
+            elif count == self.print_limit + 1:
+                print(f"ERROR: more '{category}' errors, suppressing further messages...")
+
+    def __len__(self):
+        return self.total
+
+    def all_records(self):
+        return [record for records in self.records.values() for record in records]
+
+    def report(self, examples=3):
+        """
+        Build the end-of-run error summary.
+
+        Args:
+            examples (int): Number of example files shown per category
+
+        Returns:
+            str: Multi-line report, empty if there were no errors
+        """
+        if not self.total:
+            return ""
+        lines = [f"{self.total} errors:"]
+        for category, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+            lines.append(f"  {category}: {count}")
+            for record in self.records.get(category, [])[:examples]:
+                lines.append(f"    - [{record.stage}] {record.path}: {record.message}")
+        return "\n".join(lines)
+
+    def to_list(self):
+        """Kept records as plain dicts (with their category), for the summary returned by the engines"""
+        return [
+            dict(record._asdict(), category=category)
+            for category, records in self.records.items()
+            for record in records
+        ]
@@ -0,0 +1,259 @@
+import fnmatch
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+from src.assets.error_report import with_retry
+
+# Default set of extensions processed by find_and_rename_files (lowercase, matched case-insensitively)
+DEFAULT_EXTENSIONS = frozenset([
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg',  # Images
+    '.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt',  # Documents
+    '.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.mpg', '.mpeg',  # Videos
+    '.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma',  # Audio
+    '.zip', '.rar', '.7z', '.tar', '.gz',  # Archives
+    '.xlsx', '.xls', '.csv', '.ppt', '.pptx',  # Office
+    '.html', '.htm', '.css', '.js', '.php', '.py', '.java', '.cpp', '.c',  # Code
+    '.xml', '.json', '.yaml', '.yml', '.ini', '.cfg', '.conf',  # Config
+    '.exe', '.msi', '.deb', '.rpm', '.dmg', '.pkg',  # Executables
+    '.iso', '.img', '.bin', '.cue',  # Disk images
+    '.ttf', '.otf', '.woff', '.woff2', '.eot',  # Fonts
+    '.psd', '.ai', '.eps', '.sketch', '.fig',  # Design
+    '.sql', '.db', '.sqlite', '.mdb', '.accdb',  # Databases
+    '.log', '.bak', '.tmp', '.temp', '.cache',  # System files
+    '.md', '.markdown', '.rst', '.tex', '.latex',  # Markup
+    '.sh', '.bat', '.cmd', '.ps1', '.vbs',  # Scripts
+    '.apk', '.ipa', '.app',  # Mobile/Apps
+    '.3ds', '.obj', '.fbx', '.dae', '.blend', '.max', '.ma', '.mb',  # 3D Models
+    '.srt', '.sub', '.vtt', '.ass', '.ssa',  # Subtitles
+    '.torrent', '.magnet',  # Torrents
+    '.key', '.pem', '.crt', '.cer', '.p12', '.pfx',  # Certificates
+    '.dll', '.so', '.dylib', '.lib', '.a',  # Libraries
+    '.h', '.hpp', '.hxx', '.cxx', '.cc',  # C++ headers
+    '.swift', '.kt', '.scala', '.rb', '.go', '.rs', '.dart',  # Other languages
+    '.vue', '.jsx', '.tsx', '.ts', '.svelte',  # Frontend frameworks
+    '.dockerfile', '.dockerignore', '.gitignore', '.gitattributes',  # DevOps
+    '.env', '.properties', '.toml', '.lock', '.gradle', '.maven',  # Build tools
+])
+
+# Suggested excludes: version control metadata, dependency folders and thumbnail caches
+DEFAULT_EXCLUDES = (".git", ".svn", ".hg", "node_modules", "__pycache__", ".thumbnails", "@eaDir", "Thumbs.db", ".DS_Store")
+
+# What the engines need to know about a file, captured once during the walk and
+# passed along instead of calling stat/getsize/exists again at every step
+# (ino and dev are 0 on Windows, where the directory listing doesn't report them)
+FileStat = namedtuple("FileStat", ["size", "mtime_ns", "ino", "dev"])
+
+
+def file_stat(path):
+    """
+    Stat a single file into a FileStat (for paths that did not come from a walk).
+
+    Args:
+        path (str): File to stat
+
+    Returns:
+        FileStat: Size, modification time, inode and device of the file
+    """
+    st = os.stat(path)
+    return FileStat(st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+
+def ignores_case(folder):
+    """
+    Check whether the filesystem holding folder compares names case-insensitively.
+
+    Looks the folder up again under a case-swapped name (one stat call).
+
+    Args:
+        folder (str): Existing folder
+
+    Returns:
+        bool: True on case-insensitive filesystems (NTFS, APFS/HFS+ by default); also
+              True when the folder name has no letters to test with, the safe answer
+    """
+    folder = os.path.abspath(os.fspath(folder))
+    head, name = os.path.split(folder)
+    swapped = name.swapcase()
+    if swapped == name:
+        return True
+    try:
+        return os.path.samestat(os.stat(folder), os.stat(os.path.join(head, swapped)))
+    except OSError:
+        return False
+
+
+def _compile_globs(patterns):
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+class FileFilter:
+    """
+    Decides which files a run processes, compiled once and shared by the engine and the GUI.
+
+    - extensions: set of extensions (case-insensitive), or None for all files
+    - include: glob patterns a file must match (any of them), or None
+    - exclude: glob patterns for files and folders to leave out; an excluded
+      folder is pruned before descending, so nothing below it is listed
+
+    Patterns without "/" match a single file or folder name ("node_modules",
+    "*.tmp"); patterns with "/" match the path relative to the root
+    ("cache/*/thumbs"). Each group of patterns is compiled into one regex.
+    """
+
+    def __init__(self, extensions=DEFAULT_EXTENSIONS, include=None, exclude=None):
+        if extensions is None:
+            self.extensions = None
+            self.multi_dot_extensions = ()
+        else:
+            normalized = {ext.lower() if ext.startswith('.') else '.' + ext.lower() for ext in extensions}
+            self.extensions = frozenset(normalized)
+            # Extensions like ".tar.gz" can't be found by looking at the last dot only
+            self.multi_dot_extensions = tuple(ext for ext in normalized if ext.count('.') > 1)
+
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self._include_name = _compile_globs([p for p in self.include if '/' not in p])
+        self._include_path = _compile_globs([p for p in self.include if '/' in p])
+        self._exclude_name = _compile_globs([p for p in self.exclude if '/' not in p])
+        self._exclude_path = _compile_globs([p for p in self.exclude if '/' in p])
+
+    def is_excluded(self, name, relative_path):
+        """
+        Check a file or folder against the exclude patterns.
+
+        Args:
+            name (str): File or folder name
+            relative_path (str): Path relative to the root, "/" separated
+
+        Returns:
+            bool: True if it should be left out
+        """
+        if self._exclude_name and self._exclude_name.match(name):
+            return True
+        if self._exclude_path and self._exclude_path.match(relative_path):
+            return True
+        return False
+
+    def matches_file(self, name, relative_path):
+        """
+        Check whether a file should be processed.
+
+        Args:
+            name (str): File name
+            relative_path (str): Path relative to the root, "/" separated
+
+        Returns:
+            bool: True if the file passes the extension, include and exclude filters
+        """
+        if self.extensions is not None:
+            dot = name.rfind('.')
+            if dot < 0:
+                return False
+            if name[dot:].lower() not in self.extensions:
+                if not (self.multi_dot_extensions and name.lower().endswith(self.multi_dot_extensions)):
+                    return False
+        if self._include_name or self._include_path:
+            if not ((self._include_name and self._include_name.match(name))
+                    or (self._include_path and self._include_path.match(relative_path))):
+                return False
+        return not self.is_excluded(name, relative_path)
+
+    def iter_files(self, root_folder, recursive=True, listings=None, errors=None):
+        """
+        Walk root_folder with os.scandir and yield the files that pass the filter.
+
+        File type checks use the information returned by the directory listing, so
+        no extra stat call is made per entry on most filesystems, and excluded
+        folders are never opened. Symlinked folders are not followed. Folders
+        and entries that can't be read are skipped and recorded in errors.
+
+        Args:
+            root_folder (str): Folder to walk
+            recursive (bool): If True, descend into subfolders
+            listings (dict): If given, filled with {folder path (str, as str(Path)): set
+                             of every name listed in it}, so "does the target exist?"
+                             checks can be answered without another call; a folder's
+                             listing is complete before its first file is yielded
+            errors (ErrorCollector): Receives a "scan" error for every folder or entry
+                                     that couldn't be read, so missed files are reported
+
+        Yields:
+            Path: Matching files
+        """
+        for file_path, _ in self._walk(root_folder, recursive, False, listings, errors):
+            yield file_path
+
+    def iter_entries(self, root_folder, recursive=True, listings=None, errors=None):
+        """
+        Walk like iter_files, also capturing each matching file's FileStat.
+
+        The stat comes from the directory entry (DirEntry.stat), which is free on
+        Windows and a single call elsewhere; planning, duplicate detection and
+        copying then reuse it instead of stat-ing the file again.
+
+        Args:
+            root_folder (str): Folder to walk
+            recursive (bool): If True, descend into subfolders
+            listings (dict): Filled with the folder listings, as in iter_files
+            errors (ErrorCollector): Receives the walk's "scan" errors, as in iter_files
+
+        Yields:
+            tuple: (Path, FileStat) for each matching file
+        """
+        return self._walk(root_folder, recursive, True, listings, errors)
+
+    def _walk(self, root_folder, recursive, with_stat, listings, errors):
+        stack = [(os.fspath(root_folder), "")]
+        while stack:
+            directory, relative_dir = stack.pop()
+            # Files are yielded once the folder's listing is finished, which keeps
+            # listings complete and doesn't hold the directory handle open meanwhile
+            matches = []
+            subdirectories = []
+            try:
+                with with_retry(os.scandir, directory) as entries:
+                    names = set() if listings is not None else None
+                    for entry in entries:
+                        name = entry.name
+                        if names is not None:
+                            names.add(name)
+                        relative_path = f"{relative_dir}{name}"
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive and not self.is_excluded(name, relative_path):
+                                    subdirectories.append((entry.path, relative_path + "/"))
+                            elif entry.is_file() and self.matches_file(name, relative_path):
+                                if with_stat:
+                                    st = entry.stat()
+                                    matches.append((Path(entry.path), FileStat(st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)))
+                                else:
+                                    matches.append((Path(entry.path), None))
+                        except OSError as e:
+                            if errors is not None:
+                                errors.add(entry.path, e, "scan")
+                            continue
+                    if names is not None:
+                        listings[str(Path(directory))] = names
+            except OSError as e:
+                # Unreadable folder, or the listing broke off: keep what was found
+                if errors is not None:
+                    errors.add(directory, e, "scan")
+            yield from matches
+            # Reverse so folders are visited in listing order
+            stack.extend(reversed(subdirectories))
+
+
+def parse_patterns(text):
+    """
+    Split a comma separated pattern list typed by the user.
+
+    Args:
+        text (str): e.g. ".git, node_modules, *.tmp"
+
+    Returns:
+        list: Non-empty, stripped patterns
+    """
+    return [pattern.strip() for pattern in text.split(',') if pattern.strip()]
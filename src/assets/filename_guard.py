@@ -0,0 +1,153 @@
+import hashlib
+import re
+
+# Most filesystems (NTFS, ext4, APFS) limit a single name to 255 bytes/units
+MAX_NAME_BYTES = 255
+
+# Device names Windows refuses as file names, with or without an extension
+WINDOWS_RESERVED_NAMES = frozenset(
+    ["con", "prn", "aux", "nul"]
+    + [f"com{i}" for i in range(1, 10)]
+    + [f"lpt{i}" for i in range(1, 10)]
+)
+
+HASH_LENGTH = 8
+
+# Path separators, NUL/control characters and the characters Windows refuses in names
+INVALID_CHARS = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+
+# A fallback that isn't a fixed point of the cleaner is re-cleaned at most this often
+MAX_SETTLE_ROUNDS = 3
+
+
+def short_hash(text):
+    """
+    Short, deterministic hash of a name, used to build fallback names.
+
+    Args:
+        text (str): Original name
+
+    Returns:
+        str: HASH_LENGTH decimal digits derived from the SHA-1 of the name; digits only,
+             so rules that split letters from digits leave the fallback name alone
+    """
+    digest = hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+    return f"{int(digest, 16) % 10 ** HASH_LENGTH:0{HASH_LENGTH}d}"
+
+
+def truncate_to_bytes(text, max_bytes):
+    """
+    Cut text so its UTF-8 encoding fits in max_bytes without splitting a character.
+
+    Args:
+        text (str): Text to shorten
+        max_bytes (int): Maximum encoded length
+
+    Returns:
+        str: Shortened text (unchanged if it already fits)
+    """
+    encoded = text.encode("utf-8", "surrogatepass")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", "ignore")
+
+
+def safe_filename(cleaned_stem, original_stem, extension, max_bytes=MAX_NAME_BYTES, cleaner=None):
+    """
+    Turn a cleaned stem into a filename that is always valid to create.
+
+    - Path separators, control characters and characters Windows refuses
+      (<>:"|?*) are replaced with "_", and trailing dots and spaces are
+      dropped; the fallback is "invalid_chars".
+    - An empty stem (names made only of symbols or unmapped non-ASCII text)
+      becomes "file_<hash of original stem>".
+    - A name longer than max_bytes is cut on a character boundary and gets
+      "_<hash>" appended so that long names sharing a prefix stay distinct.
+    - Windows device names (con, nul, com1...) get "_<hash>" appended.
+
+    When a cleaner is given, a fallback stem is run through it again until
+    it no longer changes, so the next run leaves the file alone.
+
+    Args:
+        cleaned_stem (str): Stem produced by the cleaner
+        original_stem (str): Stem before cleaning, used for the hash
+        extension (str): File extension including the dot (may be empty)
+        max_bytes (int): Maximum length of the full filename in UTF-8 bytes
+        cleaner (callable): Cleaner that produced cleaned_stem
+
+    Returns:
+        tuple: (filename, fallback) where fallback is None, "invalid_chars", "empty",
+               "too_long" or "reserved"
+
+    Example:
+        Input: ("", "@@@", ".jpg")
+        Output: ("file_28410784.jpg", "empty")
+    """
+    stem, extension, fallback = _guard(cleaned_stem, original_stem, extension, max_bytes)
+    if fallback is None or cleaner is None:
+        return stem + extension, fallback
+
+    for _ in range(MAX_SETTLE_ROUNDS):
+        recleaned = cleaner(stem)
+        if recleaned == stem:
+            break
+        stem, extension, _ = _guard(recleaned, original_stem, extension, max_bytes)
+    return stem + extension, fallback
+
+
+def _guard(stem, original_stem, extension, max_bytes):
+    """Apply the rules of safe_filename; returns (stem, extension, fallback)"""
+    fallback = None
+
+    if INVALID_CHARS.search(stem) or INVALID_CHARS.search(extension):
+        stem = INVALID_CHARS.sub("_", stem)
+        extension = INVALID_CHARS.sub("_", extension)
+        fallback = "invalid_chars"
+    # Windows drops trailing dots and spaces, so the name would change on creation
+    if extension:
+        if extension != extension.rstrip(". "):
+            extension = extension.rstrip(". ")
+            fallback = "invalid_chars"
+    elif stem.strip(". ") and stem != stem.rstrip(". "):
+        stem = stem.rstrip(". ")
+        fallback = "invalid_chars"
+
+    if not stem.strip(". "):
+        stem = f"file_{short_hash(original_stem)}"
+        fallback = "empty"
+    elif stem.lower() in WINDOWS_RESERVED_NAMES:
+        stem = f"{stem}_{short_hash(original_stem)}"
+        fallback = "reserved"
+
+    if (len(stem) + len(extension)) * 4 <= max_bytes:
+        # Fast path: even all 4-byte characters would fit
+        return stem, extension, fallback
+
+    extension_bytes = len(extension.encode("utf-8", "surrogatepass"))
+    if len(stem.encode("utf-8", "surrogatepass")) + extension_bytes <= max_bytes:
+        return stem, extension, fallback
+
+    suffix = f"_{short_hash(original_stem)}"
+    if extension_bytes > max_bytes // 2:
+        # Pathological extension: keep a bounded piece of it
+        extension = truncate_to_bytes(extension, max_bytes // 2)
+        extension_bytes = len(extension.encode("utf-8", "surrogatepass"))
+    stem = truncate_to_bytes(stem, max_bytes - extension_bytes - len(suffix)).rstrip("_-. ")
+    return f"{stem}{suffix}", extension, "too_long"
+
+
+# Example usage
+if __name__ == "__main__":
+    test_cases = [
+        ("my_photo", "My Photo", ".jpg"),
+        ("", "@@@###", ".jpg"),
+        ("", "北京", ".png"),
+        ("con", "CON", ".txt"),
+        ("a" * 300, "A" * 300, ".pdf"),
+        ("a/b", "a/b", ".txt"),
+        ("abc. ", "abc. ", ""),
+    ]
+
+    for cleaned, original, ext in test_cases:
+        filename, fallback = safe_filename(cleaned, original, ext)
+        print(f"'{original[:20]}{ext}' -> '{filename[:40]}' ({len(filename.encode())} bytes, fallback={fallback})")
@@ -0,0 +1,365 @@
+import os
+import shutil
+import threading
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from src.assets.naming_rules import get_cleaner
+from src.assets.dedup import find_duplicates, DEFAULT_HASH_CACHE
+from src.assets.file_filter import FileFilter, ignores_case
+from src.assets.subfolder_file_rename import iter_rename_plan
+from src.assets.error_report import ErrorCollector, with_retry
+from src.assets.io_throttle import IOLimiter, AdaptiveConcurrency, order_for_locality
+from src.assets.chunked_copy import copy_file_chunked, ChecksumMismatchError, DEFAULT_BUFFER_SIZE
+
+DEDUP_MODES = (None, "skip", "hardlink")
+COPY_ORDERS = ("directory", "inode", "plan")
+
+# Seconds between scan_callback/byte_progress_callback calls
+REPORT_INTERVAL = 0.1
+
+# With byte progress, files this large are copied in chunks so the progress moves while
+# they copy; smaller files keep the zero-copy shutil.copy2 path
+CHUNKED_PROGRESS_THRESHOLD = 64 * 1024 * 1024
+
+def _unlink_existing(path):
+    """Remove a file left by an earlier run, so a copy or link never writes through a hardlink"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _remove_failed_copy(path):
+    """Delete a partial or unverified copy so the output only holds good files"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def iter_copy_plan(input_folder, output_folder, naming_profile=None, file_filter=None, errors=None):
+    """
+    Stream the copy plan (source -> cleaned target in the output tree) while walking input_folder.
+
+    Args:
+        input_folder (str): Folder to copy from
+        output_folder (str): Folder to copy into
+        naming_profile: Naming rules to apply (see naming_rules.get_cleaner)
+        file_filter (FileFilter): Which files to copy; None copies every file
+        errors (ErrorCollector): Receives the walk's "scan" errors (see FileFilter.iter_files)
+
+    Yields:
+        dict: Plan entries as produced by subfolder_file_rename.iter_rename_plan,
+              with the FileStat captured by the walk
+    """
+    if file_filter is None:
+        file_filter = FileFilter(extensions=None)
+    input_path = Path(input_folder)
+    return iter_rename_plan(
+        file_filter.iter_entries(input_path, errors=errors),
+        get_cleaner(naming_profile),
+        source_root=input_path,
+        target_root=Path(output_folder),
+        # Two targets differing only in case would overwrite each other on such an output drive
+        ignore_case=ignores_case(output_folder if os.path.isdir(output_folder) else input_folder),
+    )
+
+def copy_and_rename_files(input_folder, output_folder, naming_profile=None, dedup=None,
+                          hash_cache_path=DEFAULT_HASH_CACHE, progress_callback=None, file_filter=None,
+                          max_workers=1, adaptive=False, bandwidth_limit=None, iops_limit=None,
+                          order="directory", byte_progress_callback=None, checksum=None, verify=False,
+                          use_mmap=False, buffer_size=DEFAULT_BUFFER_SIZE, scan_callback=None):
+    """
+    Copy every file from input_folder into output_folder with cleaned names,
+    keeping the directory structure.
+
+    Args:
+        input_folder (str): Folder to copy from
+        output_folder (str): Folder to copy into
+        naming_profile: Naming rules to apply (see naming_rules.get_cleaner)
+        dedup (str): None to copy every file, "skip" to leave byte-identical duplicates
+                     out of the output, "hardlink" to hardlink them to the first copy
+        hash_cache_path (str): Persistent hash cache used by dedup, or None to disable it
+        progress_callback (callable): Called as progress_callback(done, total) after each file
+        file_filter (FileFilter): Which files to copy; None copies every file
+        max_workers (int): Maximum number of files copied in parallel
+        adaptive (bool): If True, lower the number of parallel copies while storage
+                         latency rises and raise it again when it recovers
+        bandwidth_limit (int): Maximum bytes per second, or None for unlimited
+        iops_limit (int): Maximum files started per second, or None for unlimited
+        order (str): Copy order - "directory" (grouped by folder), "inode" (folder,
+                     then inode number) or "plan" (walk order)
+        byte_progress_callback (callable): Called as byte_progress_callback(done_bytes, total_bytes)
+                                           several times per second from the calling thread,
+                                           including in the middle of files of
+                                           CHUNKED_PROGRESS_THRESHOLD bytes or more
+        checksum (str): hashlib algorithm computed while copying (stored per copied file), or None
+        verify (bool): Re-read each copy and compare its checksum with the source
+        use_mmap (bool): Read sources through a memory map
+        buffer_size (int): Chunk size for the chunked copy
+        scan_callback (callable): Called as scan_callback(stage, done, total) before copying
+                                  starts: ("scan", files found, None) while walking and
+                                  ("hash", files hashed, files to hash) while looking for
+                                  duplicates, several times per second
+
+    Files go through the chunked copy (copy_file_chunked) when a checksum, verification
+    or a bandwidth limit is requested, or when byte progress is requested for a file of
+    CHUNKED_PROGRESS_THRESHOLD bytes or more; otherwise through shutil.copy2 (zero-copy
+    where the platform supports it). A copy that fails or doesn't verify is deleted.
+
+    Returns:
+        dict: Summary of operations performed
+    """
+    if dedup not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode: {dedup!r} (use one of {DEDUP_MODES})")
+    if order not in COPY_ORDERS:
+        raise ValueError(f"Unknown copy order: {order!r} (use one of {COPY_ORDERS})")
+
+    # Errors are collected (categorized, rate-limited) and reported once at the end of the run
+    errors = ErrorCollector(verbose=False)
+
+    # Find all files recursively and plan their names; excluded folders are never entered
+    plan = []
+    reported = time.monotonic()
+    for entry in iter_copy_plan(input_folder, output_folder, naming_profile, file_filter, errors):
+        plan.append(entry)
+        if scan_callback and time.monotonic() - reported >= REPORT_INTERVAL:
+            scan_callback("scan", len(plan), None)
+            reported = time.monotonic()
+    total = len(plan)
+    if scan_callback:
+        scan_callback("scan", total, None)
+
+    # Sizes, mtimes and inodes come from the walk; nothing below stats the sources again
+    stats = {entry["original"]: entry["stat"] for entry in plan if entry["stat"]}
+
+    hash_progress = (lambda done, to_hash: scan_callback("hash", done, to_hash)) if scan_callback else None
+    duplicates = find_duplicates(list(stats), hash_cache_path, errors=errors, stats=stats,
+                                 progress=hash_progress) if dedup else {}
+
+    copied_files = []
+    duplicate_files = []
+    skipped_files = []
+    fallback_count = 0
+    saved_bytes = 0
+    output_by_source = {}
+    done = 0
+
+    def advance():
+        nonlocal done
+        done += 1
+        if progress_callback:
+            progress_callback(done, total)
+
+    # Split the plan: entries to copy now, duplicates to handle once their original is copied
+    to_copy = {}
+    deferred = []
+    for entry in plan:
+        source = entry["original"]
+        if entry["status"] == "error":
+            errors.add(source, entry["reason"], "plan", entry.get("errno"))
+            advance()
+        elif entry["status"] == "collision":
+            skipped_files.append({
+                "path": source,
+                "reason": entry["reason"]
+            })
+            advance()
+        else:
+            if entry["fallback"]:
+                fallback_count += 1
+            if source in duplicates:
+                deferred.append(entry)
+            else:
+                to_copy[source] = entry
+
+    if order == "plan":
+        copy_order = list(to_copy)
+    else:
+        copy_order = order_for_locality(list(to_copy), by_inode=(order == "inode"), stats=stats)
+
+    limiter = IOLimiter(bandwidth_limit, iops_limit)
+    controller = AdaptiveConcurrency(max_workers) if adaptive else None
+    chunked = bool(checksum or verify or bandwidth_limit)
+    made_dirs = set()
+    checksums = {}
+
+    # Bytes copied so far; updated from worker threads, reported from this one.
+    # Duplicates count too: linked or skipped ones are done at once, the rest are copied
+    total_bytes = sum(stats[source].size for source in to_copy) + sum(stats[entry["original"]].size for entry in deferred)
+    byte_counter = [0]
+    byte_lock = threading.Lock()
+
+    def add_bytes(amount):
+        with byte_lock:
+            byte_counter[0] += amount
+
+    def copy_one(entry):
+        """Copy one file (worker thread); returns (stage, exception) on failure, None on success"""
+        source = entry["original"]
+        final_output_path = Path(entry["new"])
+        size = stats[source].size
+        in_chunks = chunked or (byte_progress_callback is not None and size >= CHUNKED_PROGRESS_THRESHOLD)
+        try:
+            limiter.acquire_operation()
+            if not in_chunks:
+                limiter.acquire_bytes(size)
+            started = time.monotonic()
+            output_path = final_output_path.parent
+            if output_path not in made_dirs:
+                output_path.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(output_path)
+        except Exception as e:
+            add_bytes(size)
+            return ("mkdir", e)
+
+        file_bytes = [0]
+        throttled = [0.0]
+
+        def charge(amount):
+            # Throttling waits are not storage latency; keep them out of the adaptive controller
+            throttled[0] += limiter.acquire_bytes(amount)
+
+        chunk_limiter = SimpleNamespace(acquire_bytes=charge)
+
+        def on_chunk(amount):
+            file_bytes[0] += amount
+            add_bytes(amount)
+
+        def attempt():
+            try:
+                return copy_file_chunked(source, final_output_path, buffer_size, use_mmap,
+                                         checksum, verify, on_chunk, chunk_limiter)
+            except Exception:
+                # Forget the partial progress so a retry doesn't count it twice
+                add_bytes(-file_bytes[0])
+                file_bytes[0] = 0
+                raise
+
+        try:
+            # A file from an earlier run may be hardlinked to other outputs; replace it, don't write into it
+            _unlink_existing(final_output_path)
+            # Copy file to output directory with cleaned name, retrying locked files and share timeouts
+            if in_chunks:
+                checksums[source] = with_retry(attempt)
+            else:
+                with_retry(shutil.copy2, source, final_output_path)
+                add_bytes(size)
+        except ChecksumMismatchError as e:
+            _remove_failed_copy(final_output_path)
+            add_bytes(size - file_bytes[0])
+            return ("verify", e)
+        except Exception as e:
+            _remove_failed_copy(final_output_path)
+            add_bytes(size - file_bytes[0])
+            return ("copy", e)
+        if controller:
+            controller.record(time.monotonic() - started - throttled[0], size)
+        return None
+
+    # With byte progress, wake up regularly to report it even while one large file is copying
+    poll_interval = REPORT_INTERVAL if byte_progress_callback else None
+
+    def run_copies(executor, entries, on_copied):
+        """Copy entries in parallel within the concurrency and I/O limits; on_copied(entry) after each success"""
+        pending = {}
+        next_index = 0
+        while next_index < len(entries) or pending:
+            limit = controller.limit if controller else max(1, max_workers)
+            while next_index < len(entries) and len(pending) < limit:
+                entry = entries[next_index]
+                next_index += 1
+                pending[executor.submit(copy_one, entry)] = entry
+            finished, _ = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in finished:
+                entry = pending.pop(future)
+                failure = future.result()
+                if failure:
+                    stage, exc = failure
+                    errors.add(entry["original"], exc, stage)
+                else:
+                    output_by_source[entry["original"]] = Path(entry["new"])
+                    on_copied(entry)
+                advance()
+            if byte_progress_callback:
+                byte_progress_callback(byte_counter[0], total_bytes)
+
+    def record_copy(entry):
+        copied = {
+            "original": entry["original"],
+            "new": entry["new"]
+        }
+        if checksums.get(entry["original"]):
+            copied["checksum"] = checksums[entry["original"]]
+        copied_files.append(copied)
+
+    link_fallbacks = set()
+
+    def record_duplicate_copy(entry):
+        if entry["original"] not in link_fallbacks:
+            record_copy(entry)
+            return
+        duplicate_files.append({
+            "path": entry["original"],
+            "duplicate_of": duplicates[entry["original"]],
+            "status": "copied"
+        })
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        run_copies(executor, [to_copy[source] for source in copy_order], record_copy)
+
+        # Duplicates: link to (or skip) the copy of their original; copy them if the original failed
+        duplicate_copies = []
+        for entry in deferred:
+            source = entry["original"]
+            final_output_path = Path(entry["new"])
+            original = duplicates[source]
+            if original not in output_by_source:
+                duplicate_copies.append(entry)
+                continue
+
+            if dedup == "hardlink":
+                try:
+                    final_output_path.parent.mkdir(parents=True, exist_ok=True)
+                    _unlink_existing(final_output_path)
+                    os.link(output_by_source[original], final_output_path)
+                except OSError:
+                    # Filesystem without hardlinks (FAT, some shares) - fall back to a real copy
+                    link_fallbacks.add(source)
+                    duplicate_copies.append(entry)
+                    continue
+                status = "hardlinked"
+            else:
+                status = "skipped"
+            saved_bytes += stats[source].size
+            add_bytes(stats[source].size)
+            duplicate_files.append({
+                "path": source,
+                "duplicate_of": original,
+                "status": status
+            })
+            advance()
+
+        # Real copies of duplicates go through the same limits and byte accounting as the rest
+        run_copies(executor, duplicate_copies, record_duplicate_copy)
+
+    if byte_progress_callback:
+        byte_progress_callback(byte_counter[0], total_bytes)
+
+    return {
+        "total_files": total,
+        "copied": len(copied_files),
+        "duplicates": len(duplicate_files),
+        "saved_bytes": saved_bytes,
+        "skipped": len(skipped_files),
+        "fallbacks": fallback_count,
+        "errors": len(errors),
+        "error_counts": dict(errors.counts),
+        "error_report": errors.report(),
+        "details": {
+            "copied_files": copied_files,
+            "duplicate_files": duplicate_files,
+            "skipped_files": skipped_files,
+            "errors": errors.to_list()
+        }
+    }
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: rate tokens per second, bursts up to capacity.
+
+    A request larger than the bucket is allowed but puts the bucket in debt,
+    so the caller (and everyone after it) waits until the rate catches up.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, amount=1):
+        """
+        Take tokens, sleeping as long as needed to respect the rate.
+
+        Args:
+            amount (float): Number of tokens (bytes, operations...)
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class IOLimiter:
+    """
+    Bandwidth (bytes/second) and IOPS (file operations/second) limits for a run.
+
+    Either limit may be None for unlimited; with both None every call is free.
+    """
+
+    def __init__(self, bytes_per_second=None, iops=None):
+        self.bandwidth = TokenBucket(bytes_per_second) if bytes_per_second else None
+        self.operations = TokenBucket(iops) if iops else None
+
+    def acquire_operation(self):
+        if self.operations:
+            self.operations.consume(1)
+
+    def acquire_bytes(self, amount):
+        """Wait for bandwidth for amount bytes; returns the seconds spent waiting"""
+        if self.bandwidth and amount > 0:
+            return self.bandwidth.consume(amount)
+        return 0
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase / multiplicative-decrease control of the number of parallel copies.
+
+    Every completed copy reports its I/O time and size. Cost is measured as
+    seconds per byte (with a 64 KiB floor so tiny files count as one small
+    operation) and smoothed with an EWMA. After each window of completions
+    the limit grows by one while the cost stays near the best seen so far
+    and is halved when the cost rises above latency_factor times that,
+    i.e. when the storage starts queueing. The best cost drifts up slowly
+    so one lucky sample can't pin the limit down forever.
+    """
+
+    MIN_COST_BYTES = 64 * 1024
+
+    def __init__(self, max_workers, min_workers=1, latency_factor=2.0, window=16):
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.latency_factor = latency_factor
+        self.window = window
+        self.limit = max(self.min_workers, self.max_workers // 2)
+        self.ewma = None
+        self.baseline = None
+        self.samples = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, size):
+        """
+        Report one finished operation.
+
+        Args:
+            seconds (float): Time spent in I/O (excluding throttling waits)
+            size (int): Bytes transferred
+        """
+        cost = seconds / max(size, self.MIN_COST_BYTES)
+        with self.lock:
+            self.ewma = cost if self.ewma is None else 0.8 * self.ewma + 0.2 * cost
+            self.samples += 1
+            if self.samples % self.window:
+                return
+            if self.baseline is None:
+                self.baseline = self.ewma
+            elif self.ewma > self.baseline * self.latency_factor:
+                self.limit = max(self.min_workers, self.limit // 2)
+            else:
+                self.limit = min(self.max_workers, self.limit + 1)
+            self.baseline = min(self.baseline * 1.05, self.ewma)
+
+
+def order_for_locality(paths, by_inode=False, stats=None):
+    """
+    Sort source paths so copies read the storage in a friendly order.
+
+    Files of the same folder are grouped together (folder order, then name),
+    which keeps directory metadata hot on network shares. With by_inode,
+    files are ordered by inode number within each folder, which on most
+    local filesystems roughly follows on-disk allocation order.
+
+    Args:
+        paths (list): Source paths (str)
+        by_inode (bool): Order by inode inside each folder (one stat per file
+                         not found in stats)
+        stats (dict): {path (str): FileStat} captured by the folder walk
+
+    Returns:
+        list: Sorted copy of paths
+    """
+    if not by_inode:
+        return sorted(paths, key=lambda path: os.path.split(path))
+
+    stats = stats or {}
+
+    def inode_key(path):
+        if path in stats:
+            return (os.path.dirname(path), stats[path].ino)
+        try:
+            return (os.path.dirname(path), os.stat(path).st_ino)
+        except OSError:
+            return (os.path.dirname(path), 0)
+    return sorted(paths, key=inode_key)
@@ -0,0 +1,327 @@
+import json
+import os
+import re
+import tomllib
+import unicodedata
+from src.assets.transliterate import DEFAULT_TABLES, get_translation_table, load_table
+
+# Built-in profiles. "default" reproduces clean_text_to_underscore exactly.
+BUILTIN_PROFILES = {
+    "default": {
+        "name": "default",
+        "rules": [
+            {"type": "lowercase"},
+            {"type": "separate_digits"},
+            {"type": "collapse_symbols"},
+        ],
+    },
+    "keep_case": {
+        "name": "keep_case",
+        "rules": [
+            {"type": "separate_digits"},
+            {"type": "collapse_symbols"},
+        ],
+    },
+    "transliterate": {
+        "name": "transliterate",
+        "rules": [
+            {"type": "transliterate"},
+            {"type": "lowercase"},
+            {"type": "separate_digits"},
+            {"type": "collapse_symbols"},
+        ],
+    },
+    "kebab": {
+        "name": "kebab",
+        "rules": [
+            {"type": "lowercase"},
+            {"type": "collapse_symbols", "separator": "-"},
+        ],
+    },
+}
+
+_DATE_PATTERNS = (
+    # 2023-01-05, 2023.01.05, 2023_01_05, 20230105
+    (re.compile(r'(?<!\d)(\d{4})[-._ ]?(0[1-9]|1[0-2])[-._ ]?(0[1-9]|[12]\d|3[01])(?!\d)'), (1, 2, 3)),
+    # 05-01-2023, 05.01.2023 (day first)
+    (re.compile(r'(?<!\d)(0[1-9]|[12]\d|3[01])[-._ ](0[1-9]|1[0-2])[-._ ](\d{4})(?!\d)'), (3, 2, 1)),
+)
+
+_compiled_cache = {}
+
+
+class NamingProfileError(ValueError):
+    """Raised when a naming profile cannot be loaded or contains an invalid rule."""
+
+
+def _regex_flags(names):
+    flags = 0
+    for name in names or ():
+        try:
+            flags |= getattr(re, name.upper())
+        except AttributeError:
+            raise NamingProfileError(f"Unknown regex flag: {name}")
+    return flags
+
+
+def _option(rule, index, key, default, kind, description):
+    """Read an optional rule field, refusing values of the wrong type"""
+    value = rule.get(key, default)
+    # bool is an int subclass, but "length = true" is a mistake
+    if not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool):
+        raise NamingProfileError(f"Rule {index}: {rule.get('type')} '{key}' must be {description}, "
+                                 f"got {value!r}")
+    return value
+
+
+def _string_list(rule, index, key, default):
+    """Read a field holding one string or a list of strings, returned as a list"""
+    value = _option(rule, index, key, default, (str, list), "a string or a list of strings")
+    if isinstance(value, str):
+        return [value]
+    if not all(isinstance(item, str) for item in value):
+        raise NamingProfileError(f"Rule {index}: {rule.get('type')} '{key}' must only contain strings, "
+                                 f"got {value!r}")
+    return value
+
+
+def _compile_rule(rule, index, namespace):
+    """
+    Compile one rule into a single Python statement operating on ``s``.
+
+    Every constant the statement needs (compiled patterns, translation
+    tables) is stored in ``namespace`` so the generated function does no
+    lookups beyond local/global name access at call time.
+
+    Returns:
+        list: Lines of source code for the fused function body
+    """
+    rule_type = rule.get("type")
+    name = f"_r{index}"
+
+    if rule_type == "lowercase":
+        return ["s = s.lower()"]
+
+    if rule_type == "uppercase":
+        return ["s = s.upper()"]
+
+    if rule_type == "separate_digits":
+        separator = _option(rule, index, "separator", "_", str, "a string")
+        namespace[name] = re.compile(r'([a-zA-Z])(\d)').sub
+        namespace[name + "_repl"] = r'\g<1>' + separator.replace('\\', r'\\') + r'\g<2>'
+        return [f"s = {name}({name}_repl, s)"]
+
+    if rule_type == "strip_prefix":
+        prefixes = _string_list(rule, index, "prefixes", [])
+        if not prefixes:
+            raise NamingProfileError(f"Rule {index}: strip_prefix needs 'prefixes'")
+        flags = re.IGNORECASE if _option(rule, index, "ignore_case", True, bool, "true or false") else 0
+        # Longest prefix first so "img_" wins over "img"
+        alternation = "|".join(re.escape(p) for p in sorted(prefixes, key=len, reverse=True))
+        namespace[name] = re.compile(rf'^(?:{alternation})', flags).sub
+        return [f"s = {name}('', s, 1)"]
+
+    if rule_type == "regex":
+        pattern = rule.get("pattern")
+        if pattern is None:
+            raise NamingProfileError(f"Rule {index}: regex needs 'pattern'")
+        pattern = _option(rule, index, "pattern", None, str, "a string")
+        flags = _regex_flags(_string_list(rule, index, "flags", []))
+        try:
+            compiled = re.compile(pattern, flags)
+        except re.error as e:
+            raise NamingProfileError(f"Rule {index}: invalid pattern {pattern!r}: {e}")
+        replacement = _option(rule, index, "replacement", "", str, "a string")
+        try:
+            # The template is parsed even without a match, so bad group references show up here
+            compiled.sub(replacement, "")
+        except (re.error, IndexError, TypeError) as e:
+            raise NamingProfileError(f"Rule {index}: invalid replacement {replacement!r}: {e}")
+        namespace[name] = compiled.sub
+        namespace[name + "_repl"] = replacement
+        return [f"s = {name}({name}_repl, s)"]
+
+    if rule_type == "normalize_dates":
+        separator = _option(rule, index, "separator", "-", str, "a string").replace('\\', r'\\')
+        lines = []
+        for i, (pattern, (y, m, d)) in enumerate(_DATE_PATTERNS):
+            key = f"{name}_{i}"
+            namespace[key] = pattern.sub
+            namespace[key + "_repl"] = rf'\g<{y}>{separator}\g<{m}>{separator}\g<{d}>'
+            lines.append(f"s = {key}({key}_repl, s)")
+        return lines
+
+    if rule_type == "transliterate":
+        tables = _string_list(rule, index, "tables", list(DEFAULT_TABLES))
+        custom_table = _option(rule, index, "custom_table", "", str, "a file path")
+        custom_items = ()
+        if custom_table:
+            try:
+                custom_items = load_table(custom_table)
+            except (OSError, ValueError) as e:
+                raise NamingProfileError(f"Rule {index}: could not load custom_table: {e}")
+        try:
+            namespace[name] = get_translation_table(tuple(tables), custom_items)
+        except ValueError as e:
+            raise NamingProfileError(f"Rule {index}: {e}")
+        namespace.setdefault("_normalize", unicodedata.normalize)
+        return [f"if not s.isascii(): s = _normalize('NFKD', s.translate({name})).translate({name})"]
+
+    if rule_type == "collapse_symbols":
+        # Equivalent to the symbol -> space -> underscore-run steps of
+        # clean_text_to_underscore, done as a single substitution.
+        separator = _option(rule, index, "separator", "_", str, "a string")
+        keep = _option(rule, index, "keep", "", str, "a string of characters")
+        if _option(rule, index, "keep_unicode", False, bool, "true or false"):
+            # Keep letters and digits of any script (e.g. CJK without a romanization table)
+            pattern = rf'(?:[^\w{re.escape(keep)}]|_)+' if "_" not in keep else rf'[^\w{re.escape(keep)}]+'
+        else:
+            pattern = rf'[^a-zA-Z0-9{re.escape(keep)}]+'
+        namespace[name] = re.compile(pattern).sub
+        namespace[name + "_sep"] = separator
+        return [f"s = {name}({name}_sep, s).strip({name}_sep)"]
+
+    if rule_type == "max_length":
+        length = rule.get("length")
+        if not isinstance(length, int) or isinstance(length, bool) or length <= 0:
+            raise NamingProfileError(f"Rule {index}: max_length needs a positive integer 'length'")
+        namespace[name + "_strip"] = _option(rule, index, "strip", "_-. ", str, "a string of characters")
+        return [f"s = s[:{length}].rstrip({name}_strip)"]
+
+    raise NamingProfileError(f"Rule {index}: unknown rule type {rule_type!r}")
+
+
+def compile_rules(rules, name="profile"):
+    """
+    Compile a list of rule dicts into one fused transformation function.
+
+    The rules are turned into straight-line Python source with all patterns
+    precompiled, so a profile runs without per-rule dispatch overhead.
+
+    Args:
+        rules (list): Rule dicts, each with a "type" key (lowercase, uppercase,
+                      separate_digits, strip_prefix, regex, normalize_dates,
+                      transliterate, collapse_symbols, max_length)
+        name (str): Name used for the generated function (shown in tracebacks)
+
+    Returns:
+        callable: Function taking a filename stem and returning the cleaned stem
+    """
+    if not isinstance(rules, list):
+        raise NamingProfileError("'rules' must be a list")
+    if not isinstance(name, str):
+        raise NamingProfileError(f"Profile 'name' must be a string, got {name!r}")
+
+    namespace = {}
+    body = []
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            raise NamingProfileError(f"Rule {index}: expected a table/object, got {type(rule).__name__}")
+        body.extend(_compile_rule(rule, index, namespace))
+
+    func_name = "clean_" + re.sub(r'\W', '_', name)
+    source = f"def {func_name}(s):\n"
+    source += "".join(f"    {line}\n" for line in body)
+    source += "    return s\n"
+    exec(compile(source, f"<naming profile {name}>", "exec"), namespace)
+
+    cleaner = namespace[func_name]
+    cleaner.profile_name = name
+    return cleaner
+
+
+def load_profile(path):
+    """
+    Read a naming profile from a .toml or .json file.
+
+    Args:
+        path (str): Path to the profile file
+
+    Returns:
+        dict: Profile with "name" and "rules" keys
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".toml":
+            with open(path, "rb") as f:
+                profile = tomllib.load(f)
+        elif extension == ".json":
+            with open(path, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+        else:
+            raise NamingProfileError(f"Unsupported profile format: {extension} (use .toml or .json)")
+    except (OSError, tomllib.TOMLDecodeError, json.JSONDecodeError) as e:
+        raise NamingProfileError(f"Could not read profile '{path}': {e}")
+
+    if not isinstance(profile, dict) or "rules" not in profile:
+        raise NamingProfileError(f"Profile '{path}' has no 'rules' list")
+    profile.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return profile
+
+
+def get_cleaner(profile=None):
+    """
+    Resolve a profile reference to a compiled cleaner function.
+
+    Compiled profiles are cached per process, keyed by built-in name or by
+    file path and modification time, so repeated calls are free.
+
+    Args:
+        profile: None (default rules), a built-in profile name, a path to a
+                 .toml/.json profile, a profile dict, or a callable which is
+                 returned unchanged
+
+    Returns:
+        callable: Function taking a filename stem and returning the cleaned stem
+    """
+    if profile is None:
+        profile = "default"
+    if callable(profile):
+        return profile
+
+    if isinstance(profile, dict):
+        return compile_rules(profile.get("rules"), profile.get("name", "profile"))
+
+    if profile in BUILTIN_PROFILES:
+        key = ("builtin", profile)
+        if key not in _compiled_cache:
+            _compiled_cache[key] = compile_rules(BUILTIN_PROFILES[profile]["rules"], profile)
+        return _compiled_cache[key]
+
+    path = os.path.abspath(profile)
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        raise NamingProfileError(f"Naming profile not found: {profile}")
+    if key not in _compiled_cache:
+        loaded = load_profile(path)
+        _compiled_cache[key] = compile_rules(loaded["rules"], loaded["name"])
+    return _compiled_cache[key]
+
+
+# Example usage
+if __name__ == "__main__":
+    from src.assets.text_symbol_replace import clean_text_to_underscore
+
+    samples = [
+        "400 million years ago, it was the ocean, and 400 million years later, it is the desert1",
+        "IMG_My Vacation Photo (2023).jpg",
+        "Scan 05.01.2023 Invoice#42",
+    ]
+
+    default_cleaner = get_cleaner()
+    custom_cleaner = get_cleaner({
+        "name": "custom",
+        "rules": [
+            {"type": "strip_prefix", "prefixes": ["IMG_", "DSC_"]},
+            {"type": "normalize_dates"},
+            {"type": "collapse_symbols", "separator": "-", "keep": "-"},
+            {"type": "max_length", "length": 40},
+        ],
+    })
+
+    for sample in samples:
+        assert default_cleaner(sample) == clean_text_to_underscore(sample)
+        print(f"'{sample}'")
+        print(f"  default -> '{default_cleaner(sample)}'")
+        print(f"  custom  -> '{custom_cleaner(sample)}'")
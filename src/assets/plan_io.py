@@ -0,0 +1,287 @@
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from src.assets.naming_rules import get_cleaner
+from src.assets.file_filter import FileFilter, DEFAULT_EXTENSIONS, ignores_case
+from src.assets.subfolder_file_rename import iter_rename_plan
+from src.assets.error_report import ErrorCollector, with_retry
+
+PLAN_FORMAT = "namerefiner-plan"
+PLAN_FORMAT_VERSION = 1
+PLAN_STATUSES = ("rename", "unchanged", "collision", "error")
+
+
+def _open_plan(path, mode):
+    # ".gz" plans are compressed on the fly; either way one JSON object per line
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="\n")
+    return open(path, mode, encoding="utf-8", newline="\n")
+
+
+def _write_line(f, record):
+    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+    f.write("\n")
+
+
+def _relative_parts(relative_path):
+    """Split a plan path, refusing anything that would leave the root folder"""
+    parts = relative_path.split("/")
+    if not relative_path or relative_path.startswith("/") or any(part in ("", ".", "..") for part in parts) \
+            or os.path.isabs(relative_path) or os.path.splitdrive(relative_path)[0]:
+        raise ValueError(f"Invalid path in plan: {relative_path!r}")
+    return parts
+
+
+def _iter_lines(f):
+    # A truncated .gz plan raises EOFError at the cut; treat it like a plain file ending there
+    try:
+        yield from enumerate(f, start=2)
+    except EOFError:
+        return
+
+
+def export_plan(root_folder, plan_path, file_extensions=None, recursive=True, naming_profile=None,
+                include=None, exclude=None, file_filter=None):
+    """
+    Plan the renames of a folder and write the plan to a file instead of applying it.
+
+    The plan is NDJSON (gzip-compressed when plan_path ends with ".gz"): a header
+    line, one line per file and a closing line with the counts. Paths are relative
+    to the root folder and "/" separated, so a plan made against a mirror can be
+    applied to the original storage with apply_plan. Each file line carries the
+    size and mtime seen while planning, so apply_plan can refuse files that changed
+    since. Lines are written as the walk goes, nothing is held in memory.
+
+    Args:
+        root_folder (str): Folder to plan
+        plan_path (str): Output file, e.g. "plan.ndjson" or "plan.ndjson.gz"
+        file_extensions (list): File extensions to process, None for file_filter.DEFAULT_EXTENSIONS
+        recursive (bool): If True, include subfolders
+        naming_profile: Naming rules to apply (see naming_rules.get_cleaner)
+        include (list): Glob patterns files must match
+        exclude (list): Glob patterns for files and folders to skip
+        file_filter (FileFilter): Prebuilt filter, overrides file_extensions/include/exclude
+
+    Returns:
+        dict: Counts of planned entries by status, the plan path and the "scan_errors"
+              of folders and entries the walk couldn't read
+    """
+    if file_filter is None:
+        file_filter = FileFilter(
+            DEFAULT_EXTENSIONS if file_extensions is None else file_extensions,
+            include=include,
+            exclude=exclude,
+        )
+    cleaner = get_cleaner(naming_profile)
+    root_path = Path(root_folder)
+    if not root_path.is_dir():
+        print(f"Error: Folder '{root_folder}' does not exist!")
+        return {"error": "Folder not found"}
+
+    counts = {"rename": 0, "unchanged": 0, "collision": 0, "error": 0}
+    listings = {}
+    # Folders the walk couldn't read have no lines in the plan; they are reported instead
+    scan_errors = ErrorCollector(verbose=False)
+    plan = iter_rename_plan(
+        file_filter.iter_entries(root_path, recursive, listings, scan_errors),
+        cleaner,
+        listings=listings,
+        ignore_case=ignores_case(root_path),
+    )
+
+    with _open_plan(plan_path, "w") as f:
+        _write_line(f, {
+            "format": PLAN_FORMAT,
+            "version": PLAN_FORMAT_VERSION,
+            "root": str(root_path.resolve()),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "naming_profile": naming_profile if naming_profile is None or isinstance(naming_profile, (str, dict))
+                              else repr(naming_profile),
+        })
+        for entry in plan:
+            status = entry["status"]
+            counts[status] = counts.get(status, 0) + 1
+            record = {
+                "path": Path(entry["original"]).relative_to(root_path).as_posix(),
+                "status": status,
+            }
+            if entry["new"]:
+                record["new"] = os.path.basename(entry["new"])
+            if entry["stat"]:
+                record["size"] = entry["stat"].size
+                record["mtime_ns"] = entry["stat"].mtime_ns
+            if entry["fallback"]:
+                record["fallback"] = entry["fallback"]
+            if status != "rename" and entry["reason"]:
+                record["reason"] = entry["reason"]
+            _write_line(f, record)
+        _write_line(f, {"end": True, "counts": counts, "scan_errors": len(scan_errors)})
+
+    print(f"Plan written to {plan_path}: {counts['rename']} renames, {counts['collision']} collisions, "
+          f"{counts['unchanged']} unchanged, {counts['error']} errors")
+    if scan_errors:
+        print(scan_errors.report())
+    return {
+        "plan_path": str(plan_path),
+        "total_files": sum(counts.values()),
+        "planned": counts["rename"],
+        "skipped": counts["unchanged"] + counts["collision"],
+        "errors": counts["error"] + len(scan_errors),
+        "scan_errors": scan_errors.to_list(),
+        "counts": counts,
+    }
+
+
+def apply_plan(plan_path, root_folder=None, dry_run=True, check_mtime=True):
+    """
+    Apply a plan written by export_plan, checking each file before renaming it.
+
+    The plan is streamed, so a plan of millions of files applies in constant
+    memory. A file is skipped (and reported) when it is missing or its size or
+    mtime differ from the plan, and when its new name has appeared since
+    planning; other lines ("unchanged", "collision", "error") are counted as
+    skipped.
+
+    Args:
+        plan_path (str): Plan file (".gz" for a compressed plan)
+        root_folder (str): Folder to apply the plan to; defaults to the folder the plan
+                           was made from (use this when the plan was made on a mirror)
+        dry_run (bool): If True, only validate and show what would be renamed
+        check_mtime (bool): Compare modification times as well as sizes; turn off when
+                            the mirror doesn't preserve mtimes exactly
+
+    Returns:
+        dict: Summary of operations performed, like find_and_rename_files
+    """
+    renamed_files = []
+    skipped_files = []
+    errors = ErrorCollector()
+    total = 0
+    complete = False
+
+    with _open_plan(plan_path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != PLAN_FORMAT:
+            raise ValueError(f"{plan_path} is not a rename plan")
+        if header.get("version") != PLAN_FORMAT_VERSION:
+            raise ValueError(f"Unsupported plan version {header.get('version')} in {plan_path}")
+        root = os.path.abspath(root_folder if root_folder is not None else header["root"])
+        if not os.path.isdir(root):
+            print(f"Error: Folder '{root}' does not exist!")
+            return {"error": "Folder not found"}
+
+        print(f"Applying plan {plan_path} to {root}")
+        print(f"Dry run mode: {dry_run}")
+        print("-" * 60)
+
+        for line_number, line in _iter_lines(f):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut in half: the plan was truncated here
+                break
+            if not isinstance(record, dict):
+                total += 1
+                errors.add(f"{plan_path}:{line_number}", "Malformed plan entry", "plan")
+                continue
+            if record.get("end"):
+                complete = True
+                break
+            total += 1
+            relative_path = record.get("path", "")
+            try:
+                source = os.path.join(root, *_relative_parts(relative_path))
+            except ValueError as e:
+                errors.add(f"{plan_path}:{line_number}", e, "plan")
+                continue
+
+            status = record.get("status")
+            if status not in PLAN_STATUSES:
+                errors.add(f"{plan_path}:{line_number}", f"Unknown status in plan: {status!r}", "plan")
+                continue
+            if status != "rename":
+                skipped_files.append({
+                    "path": source,
+                    "reason": record.get("reason") or status
+                })
+                continue
+
+            new_filename = record.get("new", "")
+            if new_filename in ("", ".", "..") or "/" in new_filename or os.sep in new_filename:
+                errors.add(source, f"Invalid new name in plan: {new_filename!r}", "plan")
+                continue
+            target = os.path.join(os.path.dirname(source), new_filename)
+
+            # The file must still be the one that was planned
+            try:
+                st = os.stat(source)
+            except OSError as e:
+                errors.add(source, e, "validate")
+                continue
+            try:
+                if st.st_size != record.get("size") or (check_mtime and st.st_mtime_ns != record.get("mtime_ns")):
+                    skipped_files.append({
+                        "path": source,
+                        "reason": "Changed since planning"
+                    })
+                    continue
+                # ...and the new name must still be free (a case-only rename finds the file itself)
+                try:
+                    if not os.path.samestat(os.lstat(target), st):
+                        skipped_files.append({
+                            "path": source,
+                            "reason": f"Target file already exists: {new_filename}"
+                        })
+                        continue
+                except FileNotFoundError:
+                    pass
+
+                if dry_run:
+                    print(f"WOULD RENAME: {os.path.basename(source)} -> {new_filename}")
+                    renamed_files.append({
+                        "original": source,
+                        "new": target,
+                        "status": "would_rename"
+                    })
+                else:
+                    with_retry(os.rename, source, target)
+                    print(f"RENAMED: {os.path.basename(source)} -> {new_filename}")
+                    renamed_files.append({
+                        "original": source,
+                        "new": target,
+                        "status": "renamed"
+                    })
+            except Exception as e:
+                errors.add(source, e, "rename")
+
+    if not complete:
+        # Plan cut short (interrupted export, partial transfer): what was read was applied
+        errors.add(plan_path, "Plan file is incomplete (no closing line)", "plan")
+
+    print("\n" + "=" * 60)
+    print("SUMMARY:")
+    print(f"Files in plan: {total}")
+    print(f"Files {'would be ' if dry_run else ''}renamed: {len(renamed_files)}")
+    print(f"Files skipped: {len(skipped_files)}")
+    print(f"Errors: {len(errors)}")
+    if errors:
+        print("\n" + errors.report())
+
+    return {
+        "total_files": total,
+        "renamed": len(renamed_files),
+        "skipped": len(skipped_files),
+        "errors": len(errors),
+        "complete": complete,
+        "error_counts": dict(errors.counts),
+        "error_report": errors.report(),
+        "details": {
+            "renamed_files": renamed_files,
+            "skipped_files": skipped_files,
+            "errors": errors.to_list()
+        }
+    }
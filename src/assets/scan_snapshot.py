@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from src.assets.error_report import with_retry
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".namerefiner", "scan_snapshot.db")
+
+# A folder modified this close to its listing may change again within the same
+# mtime tick (2 s on FAT), so its listing is stored but not trusted next run
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+# "/" can't appear in a file name on any platform, so it separates stored names
+NAME_SEPARATOR = "/"
+
+
+def _join_names(names):
+    return NAME_SEPARATOR.join(sorted(names))
+
+
+def _split_names(text):
+    return set(text.split(NAME_SEPARATOR)) if text else set()
+
+
+def run_signature(file_filter, recursive, naming_profile):
+    """
+    Describe the settings a snapshot was taken with.
+
+    A snapshot only says which names were already handled, so it is discarded
+    when the filter, recursion or naming rules change.
+
+    Args:
+        file_filter (FileFilter): Filter of the run
+        recursive (bool): Recursive setting of the run
+        naming_profile: Naming profile of the run (see naming_rules.get_cleaner)
+
+    Returns:
+        str: Signature to compare with the stored one
+    """
+    if naming_profile is None or isinstance(naming_profile, dict):
+        profile = naming_profile
+    elif isinstance(naming_profile, (str, os.PathLike)) and os.path.isfile(naming_profile):
+        # Profile file: an edit changes the rules, so its mtime is part of the signature
+        profile = [os.path.abspath(naming_profile), os.stat(naming_profile).st_mtime_ns]
+    else:
+        profile = str(naming_profile) if isinstance(naming_profile, (str, os.PathLike)) else repr(naming_profile)
+    return json.dumps([
+        sorted(file_filter.extensions) if file_filter.extensions is not None else None,
+        file_filter.include,
+        file_filter.exclude,
+        recursive,
+        profile,
+    ], sort_keys=True, default=str)
+
+
+class ScanSnapshot:
+    """
+    Per-folder modification time and name list of a tree, stored in SQLite.
+
+    Adding, removing or renaming an entry updates its folder's mtime, so a
+    folder whose mtime matches the snapshot needs no listing: its subfolders
+    are known from the snapshot and only they are stat-ed. Only changed
+    folders are listed, and only names not seen before are planned. Editing
+    a file's content doesn't change its folder, which is fine here: renames
+    depend on names only.
+
+    Changes made during a run are kept in memory and written by commit(), so
+    a dry run or an interrupted run leaves the previous snapshot in place.
+    """
+
+    def __init__(self, root_folder, signature, snapshot_path=DEFAULT_SNAPSHOT_PATH):
+        directory = os.path.dirname(snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.root_path = os.path.abspath(root_folder)
+        self.root = os.path.normcase(self.root_path)
+        self.signature = signature
+        self.connection = sqlite3.connect(snapshot_path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS folders ("
+            "root TEXT, path TEXT, mtime_ns INTEGER, subfolders TEXT, files TEXT, "
+            "PRIMARY KEY (root, path))"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS roots (root TEXT PRIMARY KEY, signature TEXT)"
+        )
+        row = self.connection.execute(
+            "SELECT signature FROM roots WHERE root = ?", (self.root,)
+        ).fetchone()
+        # Different settings: start over with a full scan
+        self.valid = row is not None and row[0] == signature
+        self.visited = set()
+        self.pending = {}       # relative folder -> [mtime_ns, subfolders, files, listed at (ns)]
+        self.dirty_folders = set()
+        self.listed = 0
+        self.unchanged = 0
+
+    def get(self, relative_dir):
+        """
+        Stored state of a folder.
+
+        Args:
+            relative_dir (str): Folder relative to the root, "/" terminated ("" for the root)
+
+        Returns:
+            tuple: (mtime_ns, subfolder names, file names), or None if unknown
+        """
+        if not self.valid:
+            return None
+        row = self.connection.execute(
+            "SELECT mtime_ns, subfolders, files FROM folders WHERE root = ? AND path = ?",
+            (self.root, relative_dir),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], _split_names(row[1]), _split_names(row[2])
+
+    def record(self, relative_dir, mtime_ns, subfolders, files):
+        """Remember the listing of a changed folder (written by commit)"""
+        self.pending[relative_dir] = [mtime_ns, set(subfolders), set(files), time.time_ns()]
+
+    def record_rename(self, original, new):
+        """
+        Update a listed folder after one of its files was renamed.
+
+        Args:
+            original (str): Old file path
+            new (str): New file path (same folder)
+        """
+        relative_dir = self._relative_dir(os.path.dirname(original))
+        state = self.pending.get(relative_dir)
+        if state is None:
+            return
+        state[2].discard(os.path.basename(original))
+        state[2].add(os.path.basename(new))
+        self.dirty_folders.add(relative_dir)
+
+    def forget(self, path):
+        """
+        Drop a file from its folder's listing so the next run plans it again (e.g. after an error).
+
+        Args:
+            path (str): File path
+        """
+        relative_dir = self._relative_dir(os.path.dirname(path))
+        state = self.pending.get(relative_dir)
+        if state is not None:
+            state[2].discard(os.path.basename(path))
+            self.dirty_folders.add(relative_dir)
+
+    def _relative_dir(self, folder):
+        relative = os.path.relpath(os.path.abspath(folder), self.root_path)
+        if relative == os.curdir:
+            return ""
+        return relative.replace(os.sep, "/") + "/"
+
+    def commit(self):
+        """
+        Store the folders listed in this run and drop folders that are gone.
+
+        Folders this run renamed files in, and folders modified just before they
+        were listed, are stored with their names but listed again next run: their
+        mtime can't tell our own changes or a same-tick change from someone else's.
+        """
+        rows = []
+        for relative_dir, (mtime_ns, subfolders, files, listed_ns) in self.pending.items():
+            if relative_dir in self.dirty_folders or mtime_ns >= listed_ns - RACY_WINDOW_NS:
+                mtime_ns = -1
+            rows.append((self.root, relative_dir, mtime_ns, _join_names(subfolders), _join_names(files)))
+
+        with self.connection:
+            if not self.valid:
+                self.connection.execute("DELETE FROM folders WHERE root = ?", (self.root,))
+            else:
+                stored = self.connection.execute(
+                    "SELECT path FROM folders WHERE root = ?", (self.root,)
+                ).fetchall()
+                self.connection.executemany(
+                    "DELETE FROM folders WHERE root = ? AND path = ?",
+                    [(self.root, path) for (path,) in stored if path not in self.visited],
+                )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO folders (root, path, mtime_ns, subfolders, files) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO roots (root, signature) VALUES (?, ?)",
+                (self.root, self.signature),
+            )
+        self.pending = {}
+        self.valid = True
+
+    def close(self):
+        self.connection.close()
+
+
+def iter_changed_files(file_filter, root_folder, snapshot, recursive=True, listings=None, errors=None):
+    """
+    Walk only the folders that changed since the snapshot and yield their new files.
+
+    Unchanged folders cost one stat each (to check their subfolders); changed
+    or unknown folders are listed with os.scandir like FileFilter.iter_files.
+    Files already present in the snapshot's listing of a folder are not yielded.
+    A folder that couldn't be listed completely is not stored, so the next run
+    lists it again.
+
+    Args:
+        file_filter (FileFilter): Which files and folders to consider
+        root_folder (str): Folder to walk
+        snapshot (ScanSnapshot): State of the previous run; updated with this walk
+        recursive (bool): If True, descend into subfolders
+        listings (dict): Filled with the full listing of every folder that was listed
+        errors (ErrorCollector): Receives a "scan" error for every folder or entry that
+                                 couldn't be read
+
+    Yields:
+        Path: New files that pass the filter
+    """
+    root = os.fspath(root_folder)
+    stack = [(root, "", os.lstat(root).st_mtime_ns)]
+    while stack:
+        directory, relative_dir, mtime_ns = stack.pop()
+        snapshot.visited.add(relative_dir)
+        previous = snapshot.get(relative_dir)
+        subdirectories = []
+
+        if previous is not None and previous[0] == mtime_ns:
+            # Unchanged folder: no listing, just check each known subfolder's mtime
+            snapshot.unchanged += 1
+            if recursive:
+                for name in sorted(previous[1]):
+                    relative_path = f"{relative_dir}{name}"
+                    if file_filter.is_excluded(name, relative_path):
+                        continue
+                    path = os.path.join(directory, name)
+                    try:
+                        subdirectories.append((path, relative_path + "/", os.lstat(path).st_mtime_ns))
+                    except OSError as e:
+                        if errors is not None:
+                            errors.add(path, e, "scan")
+                        continue
+            stack.extend(reversed(subdirectories))
+            continue
+
+        snapshot.listed += 1
+        known_files = previous[2] if previous is not None else set()
+        names = set()
+        subfolder_names = []
+        file_names = []
+        matches = []
+        complete = True
+        try:
+            with with_retry(os.scandir, directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    names.add(name)
+                    relative_path = f"{relative_dir}{name}"
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subfolder_names.append(name)
+                            if recursive and not file_filter.is_excluded(name, relative_path):
+                                # lstat rather than the listing's cached stat: on Windows the
+                                # listing may report a folder's mtime lazily
+                                subdirectories.append((entry.path, relative_path + "/", os.lstat(entry.path).st_mtime_ns))
+                        elif entry.is_file():
+                            file_names.append(name)
+                            if name not in known_files and file_filter.matches_file(name, relative_path):
+                                matches.append(Path(entry.path))
+                    except OSError as e:
+                        if errors is not None:
+                            errors.add(entry.path, e, "scan")
+                        complete = False
+        except OSError as e:
+            if errors is not None:
+                errors.add(directory, e, "scan")
+            complete = False
+
+        if not complete:
+            # Unreadable folder, an unreadable entry, or the listing broke off:
+            # don't store it, list it again next run
+            snapshot.visited.discard(relative_dir)
+            yield from matches
+            stack.extend(reversed(subdirectories))
+            continue
+
+        snapshot.record(relative_dir, mtime_ns, subfolder_names, file_names)
+        if listings is not None:
+            listings[str(Path(directory))] = names
+        yield from matches
+        # Reverse so folders are visited in listing order
+        stack.extend(reversed(subdirectories))
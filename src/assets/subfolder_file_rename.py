@@ -1,57 +1,174 @@
 import os
-import shutil
+from itertools import groupby
 from pathlib import Path
-from src.assets.text_symbol_replace import clean_text_to_underscore
+from src.assets.naming_rules import get_cleaner
+from src.assets.filename_guard import safe_filename, MAX_NAME_BYTES
+from src.assets.file_filter import FileFilter, DEFAULT_EXTENSIONS, ignores_case
+from src.assets.error_report import ErrorCollector, with_retry
+from src.assets.scan_snapshot import ScanSnapshot, iter_changed_files, run_signature, DEFAULT_SNAPSHOT_PATH
 
-def find_and_rename_files(root_folder, file_extensions=None, dry_run=True, recursive=True):
+def iter_rename_plan(files_to_process, cleaner, max_name_bytes=MAX_NAME_BYTES, source_root=None, target_root=None,
+                     listings=None, ignore_case=False):
     """
-    Find files in folder and subfolders, rename them using clean_text_to_underscore function.
+    Planning phase: work out the new name of every file without renaming anything.
+    
+    Names that clean to nothing, exceed the filesystem name limit, contain path
+    separators or characters Windows refuses, or hit a Windows device name get a
+    deterministic fallback (see filename_guard.safe_filename), and
+    two files cleaning to the same name are detected here, so applying the plan never
+    attempts an invalid or clashing target. A file that keeps its name always keeps
+    it; another file cleaning to that name is the collision, whatever the walk order.
+    Entries are produced one folder at a time, so a plan can be consumed (or
+    previewed) while the folder walk is still running.
+    
+    Args:
+        files_to_process (iterable): Path objects of the files to rename, or (Path, FileStat)
+                                     pairs from FileFilter.iter_entries
+        cleaner (callable): Function turning a stem into a cleaned stem
+        max_name_bytes (int): Maximum length of a filename in UTF-8 bytes
+        source_root (Path): For copy plans, the folder files_to_process live under
+        target_root (Path): For copy plans, the folder the cleaned tree is copied into;
+                            None plans in-place renames
+        listings (dict): Folder listings from FileFilter.iter_files/iter_entries; in-place
+                         targets are looked up there instead of stat-ing them
+        ignore_case (bool): Whether the filesystem ignores case (see file_filter.ignores_case),
+                            so listing lookups match the way the filesystem compares names
+        
+    Yields:
+        dict: Plan entry with "original", "new", "status" ("rename", "unchanged",
+              "collision" or "error"), "reason", "fallback" (None, "invalid_chars",
+              "empty", "too_long" or "reserved") and "stat" (the FileStat, or None when
+              given plain paths); error entries also carry "errno"
+    """
+    claimed_targets = set()
+    folded_listings = {}
+    
+    # The walk yields a folder's files together; plan them as one batch so files keeping
+    # their name claim it before any other file of the folder is renamed to it
+    for _, batch in groupby(files_to_process, key=_parent_folder):
+        planned = [_plan_name(item, cleaner, max_name_bytes, source_root, target_root) for item in batch]
+        
+        for entry, file_path, new_file_path in planned:
+            # Check if filename actually changed
+            if new_file_path is not None and new_file_path.name == file_path.name:
+                entry["status"] = "unchanged"
+                entry["reason"] = "No changes needed"
+                claimed_targets.add(_claim_key(new_file_path, ignore_case))
+        
+        for entry, file_path, new_file_path in planned:
+            if entry["status"] != "rename":
+                continue
+            new_filename = new_file_path.name
+            
+            # Check if another file in this run already takes the target name
+            if _claim_key(new_file_path, ignore_case) in claimed_targets:
+                entry["status"] = "collision"
+                entry["reason"] = f"Target name already planned for another file: {new_filename}"
+            
+            # Check if target file already exists (copies overwrite earlier output)
+            elif target_root is None and _target_exists(file_path, new_filename, listings, ignore_case, folded_listings):
+                entry["status"] = "collision"
+                entry["reason"] = f"Target file already exists: {new_filename}"
+            
+            else:
+                claimed_targets.add(_claim_key(new_file_path, ignore_case))
+        
+        for entry, _, _ in planned:
+            yield entry
+
+def _claim_key(path, ignore_case):
+    """Targets differing only in case are the same file on a case-insensitive filesystem"""
+    return str(path).casefold() if ignore_case else path
+
+def _parent_folder(item):
+    return (item[0] if isinstance(item, tuple) else item).parent
+
+def _plan_name(item, cleaner, max_name_bytes, source_root, target_root):
+    """Work out one file's target; returns (entry, file path, target path or None on error)"""
+    if isinstance(item, tuple):
+        file_path, stat = item
+    else:
+        file_path, stat = item, None
+    entry = {"original": str(file_path), "new": None, "status": "rename", "reason": None, "fallback": None,
+             "stat": stat}
+    try:
+        # Get original filename without extension
+        original_name = file_path.stem
+        file_extension = file_path.suffix
+        
+        # Clean the filename and make sure the result is a valid name
+        cleaned_name = cleaner(original_name)
+        new_filename, entry["fallback"] = safe_filename(cleaned_name, original_name, file_extension,
+                                                        max_name_bytes, cleaner)
+        if target_root is None:
+            new_file_path = file_path.parent / new_filename
+        else:
+            # Keep the directory structure below target_root
+            new_file_path = target_root / file_path.parent.relative_to(source_root) / new_filename
+        entry["new"] = str(new_file_path)
+        return entry, file_path, new_file_path
+    
+    except Exception as e:
+        entry["status"] = "error"
+        entry["reason"] = str(e)
+        entry["errno"] = getattr(e, "errno", None)
+        return entry, file_path, None
+
+def _target_exists(file_path, new_filename, listings, ignore_case, folded_listings):
+    """Check whether new_filename exists next to file_path, using the walk's listing when there is one"""
+    folder = str(file_path.parent)
+    names = listings.get(folder) if listings is not None else None
+    if names is None:
+        return (file_path.parent / new_filename).exists()
+    if not ignore_case:
+        return new_filename in names
+    # On case-insensitive filesystems the file itself matches a case-only rename, so skip it
+    folded = folded_listings.get(folder)
+    if folded is None:
+        folded = folded_listings[folder] = {}
+        for name in names:
+            folded.setdefault(name.casefold(), set()).add(name)
+    return bool(folded.get(new_filename.casefold(), set()) - {file_path.name})
+
+def find_and_rename_files(root_folder, file_extensions=None, dry_run=True, recursive=True, naming_profile=None,
+                          include=None, exclude=None, file_filter=None, incremental=False,
+                          snapshot_path=DEFAULT_SNAPSHOT_PATH):
+    """
+    Find files in folder and subfolders, rename them using clean_text_to_underscore function
+    or the rules of a naming profile.
     
     Args:
         root_folder (str): Root folder path to search
         file_extensions (list): List of file extensions to process (e.g., ['.jpg', '.png', '.pdf'])
-                              If None, processes all files
+                              If None, uses file_filter.DEFAULT_EXTENSIONS
         dry_run (bool): If True, only show what would be renamed without actually renaming
         recursive (bool): If True, search subfolders recursively
+        naming_profile: Naming rules to apply - None for the default rules (same as
+                        clean_text_to_underscore), a built-in profile name, a path to a
+                        .toml/.json profile, or a profile dict (see naming_rules.py)
+        include (list): Glob patterns files must match (e.g., ['*_final*'])
+        exclude (list): Glob patterns for files and folders to skip (e.g., ['.git', 'node_modules'])
+        file_filter (FileFilter): Prebuilt filter, overrides file_extensions/include/exclude
+        incremental (bool): If True, only list folders whose mtime changed since the last
+                            run and only plan files that are new in them (see scan_snapshot.py);
+                            the first run, or a run with different settings, scans everything
+        snapshot_path (str): SQLite file holding the snapshot for incremental runs; it is
+                             updated after non-dry runs only
         
     Returns:
-        dict: Summary of operations performed
+        dict: Summary of operations performed; incremental runs add "folders_listed"
+              and "folders_unchanged"
     """
-    if file_extensions is None:
-        file_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg',  # Images
-                          '.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt',  # Documents
-                          '.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.mpg', '.mpeg',  # Videos
-                          '.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma',  # Audio
-                          '.zip', '.rar', '.7z', '.tar', '.gz',  # Archives
-                          '.xlsx', '.xls', '.csv', '.ppt', '.pptx',  # Office
-                          '.html', '.htm', '.css', '.js', '.php', '.py', '.java', '.cpp', '.c',  # Code
-                          '.xml', '.json', '.yaml', '.yml', '.ini', '.cfg', '.conf',  # Config
-                          '.exe', '.msi', '.deb', '.rpm', '.dmg', '.pkg',  # Executables
-                          '.iso', '.img', '.bin', '.cue',  # Disk images
-                          '.ttf', '.otf', '.woff', '.woff2', '.eot',  # Fonts
-                          '.psd', '.ai', '.eps', '.sketch', '.fig',  # Design
-                          '.sql', '.db', '.sqlite', '.mdb', '.accdb',  # Databases
-                          '.log', '.bak', '.tmp', '.temp', '.cache',  # System files
-                          '.md', '.markdown', '.rst', '.tex', '.latex',  # Markup
-                          '.sh', '.bat', '.cmd', '.ps1', '.vbs',  # Scripts
-                          '.apk', '.ipa', '.app', '.dmg', '.pkg',  # Mobile/Apps
-                          '.3ds', '.obj', '.fbx', '.dae', '.blend', '.max', '.ma', '.mb',  # 3D Models
-                          '.srt', '.sub', '.vtt', '.ass', '.ssa',  # Subtitles
-                          '.torrent', '.magnet',  # Torrents
-                          '.key', '.pem', '.crt', '.cer', '.p12', '.pfx',  # Certificates
-                          '.dll', '.so', '.dylib', '.lib', '.a',  # Libraries
-                          '.h', '.hpp', '.hxx', '.cxx', '.cc',  # C++ headers
-                          '.swift', '.kt', '.scala', '.rb', '.go', '.rs', '.dart',  # Other languages
-                          '.vue', '.jsx', '.tsx', '.ts', '.svelte',  # Frontend frameworks
-                          '.dockerfile', '.dockerignore', '.gitignore', '.gitattributes',  # DevOps
-                          '.env', '.properties', '.toml', '.lock', '.gradle', '.maven',  # Build tools
-                          '.jpeg', '.JPG', '.JPEG', '.PNG', '.GIF', '.BMP', '.TIFF', '.WEBP', '.SVG',  # Uppercase images
-                          '.PDF', '.DOC', '.DOCX', '.TXT', '.RTF', '.ODT',  # Uppercase documents
-                          '.MP4', '.AVI', '.MOV', '.WMV', '.FLV', '.MKV', '.MPG', '.MPEG',  # Uppercase videos
-                          '.MP3', '.WAV', '.FLAC', '.AAC', '.OGG', '.WMA']  # Uppercase audio
-    
-    # Convert extensions to lowercase for comparison
-    file_extensions = [ext.lower() for ext in file_extensions]
+    # Extension set and include/exclude globs are compiled once for the whole walk
+    if file_filter is None:
+        file_filter = FileFilter(
+            DEFAULT_EXTENSIONS if file_extensions is None else file_extensions,
+            include=include,
+            exclude=exclude,
+        )
+    
+    # Compile the naming rules once for the whole run
+    cleaner = get_cleaner(naming_profile)
     
     root_path = Path(root_folder)
     if not root_path.exists():
@@ -60,76 +177,83 @@ def find_and_rename_files(root_folder, file_extensions=None, dry_run=True, recur
     
     renamed_files = []
     skipped_files = []
-    errors = []
-    
-    # Get all files based on recursive setting
-    if recursive:
-        files_to_process = []
-        for ext in file_extensions:
-            files_to_process.extend(root_path.rglob(f"*{ext}"))
-            files_to_process.extend(root_path.rglob(f"*{ext.upper()}"))
+    errors = ErrorCollector()
+    fallback_count = 0
+    
+    # Get all files based on recursive setting; excluded folders are never entered.
+    # The walk keeps each folder's listing, so target checks need no extra calls
+    listings = {}
+    snapshot = None
+    if incremental:
+        snapshot = ScanSnapshot(root_path, run_signature(file_filter, recursive, naming_profile), snapshot_path)
+        files_to_process = list(iter_changed_files(file_filter, root_path, snapshot, recursive, listings, errors))
+        print(f"Incremental scan: {snapshot.listed} folders listed, {snapshot.unchanged} unchanged")
     else:
-        files_to_process = []
-        for ext in file_extensions:
-            files_to_process.extend(root_path.glob(f"*{ext}"))
-            files_to_process.extend(root_path.glob(f"*{ext.upper()}"))
+        files_to_process = list(file_filter.iter_files(root_path, recursive, listings, errors))
     
     print(f"Found {len(files_to_process)} files to process...")
-    print(f"File extensions: {file_extensions}")
+    print(f"File extensions: {'all' if file_filter.extensions is None else len(file_filter.extensions)}")
+    if file_filter.include:
+        print(f"Include patterns: {file_filter.include}")
+    if file_filter.exclude:
+        print(f"Exclude patterns: {file_filter.exclude}")
     print(f"Recursive search: {recursive}")
     print(f"Dry run mode: {dry_run}")
     print("-" * 60)
     
-    for file_path in files_to_process:
+    for entry in iter_rename_plan(files_to_process, cleaner, listings=listings, ignore_case=ignores_case(root_path)):
+        if entry["status"] == "error":
+            errors.add(entry["original"], entry["reason"], "plan", entry.get("errno"))
+            if snapshot:
+                snapshot.forget(entry["original"])
+            continue
+        
+        if entry["status"] in ("unchanged", "collision"):
+            skipped_files.append({
+                "path": entry["original"],
+                "reason": entry["reason"]
+            })
+            if snapshot and entry["status"] == "collision":
+                # The blocking name may be gone next run; plan this file again then
+                snapshot.forget(entry["original"])
+            continue
+        
+        if entry["fallback"]:
+            fallback_count += 1
+        
+        original_name = os.path.basename(entry["original"])
+        new_filename = os.path.basename(entry["new"])
         try:
-            # Get original filename without extension
-            original_name = file_path.stem
-            file_extension = file_path.suffix
-            
-            # Clean the filename using our function
-            cleaned_name = clean_text_to_underscore(original_name)
-            
-            # Create new filename
-            new_filename = f"{cleaned_name}{file_extension}"
-            new_file_path = file_path.parent / new_filename
-            
-            # Check if filename actually changed
-            if original_name == cleaned_name:
-                skipped_files.append({
-                    "path": str(file_path),
-                    "reason": "No changes needed"
-                })
-                continue
-            
-            # Check if target file already exists
-            if new_file_path.exists() and new_file_path != file_path:
-                skipped_files.append({
-                    "path": str(file_path),
-                    "reason": f"Target file already exists: {new_filename}"
-                })
-                continue
-            
             if dry_run:
-                print(f"WOULD RENAME: {file_path.name} -> {new_filename}")
+                print(f"WOULD RENAME: {original_name} -> {new_filename}")
                 renamed_files.append({
-                    "original": str(file_path),
-                    "new": str(new_file_path),
+                    "original": entry["original"],
+                    "new": entry["new"],
                     "status": "would_rename"
                 })
             else:
-                # Actually rename the file
-                shutil.move(str(file_path), str(new_file_path))
-                print(f"RENAMED: {file_path.name} -> {new_filename}")
+                # Actually rename the file; the target is in the same folder and known not
+                # to exist, so a plain rename does (shutil.move would stat it again)
+                with_retry(os.rename, entry["original"], entry["new"])
+                if snapshot:
+                    snapshot.record_rename(entry["original"], entry["new"])
+                print(f"RENAMED: {original_name} -> {new_filename}")
                 renamed_files.append({
-                    "original": str(file_path),
-                    "new": str(new_file_path),
+                    "original": entry["original"],
+                    "new": entry["new"],
                     "status": "renamed"
                 })
                 
         except Exception as e:
-            error_msg = f"Error processing {file_path}: {str(e)}"
-            print(f"ERROR: {error_msg}")
-            errors.append(error_msg)
+            errors.add(entry["original"], e, "rename")
+            if snapshot:
+                # Try this file again next run
+                snapshot.forget(entry["original"])
+    
+    if snapshot:
+        if not dry_run:
+            snapshot.commit()
+        snapshot.close()
     
     # Print summary
     print("\n" + "=" * 60)
@@ -137,6 +261,7 @@ def find_and_rename_files(root_folder, file_extensions=None, dry_run=True, recur
     print(f"Files processed: {len(files_to_process)}")
     print(f"Files {'would be ' if dry_run else ''}renamed: {len(renamed_files)}")
     print(f"Files skipped: {len(skipped_files)}")
+    print(f"Fallback names used: {fallback_count}")
     print(f"Errors: {len(errors)}")
     
     if skipped_files:
@@ -147,23 +272,26 @@ def find_and_rename_files(root_folder, file_extensions=None, dry_run=True, recur
             print(f"  ... and {len(skipped_files) - 10} more")
     
     if errors:
-        print("\nErrors:")
-        for error in errors[:5]:  # Show first 5
-            print(f"  - {error}")
-        if len(errors) > 5:
-            print(f"  ... and {len(errors) - 5} more")
+        print("\n" + errors.report())
     
-    return {
+    result = {
         "total_files": len(files_to_process),
         "renamed": len(renamed_files),
         "skipped": len(skipped_files),
+        "fallbacks": fallback_count,
         "errors": len(errors),
+        "error_counts": dict(errors.counts),
+        "error_report": errors.report(),
         "details": {
             "renamed_files": renamed_files,
             "skipped_files": skipped_files,
-            "errors": errors
+            "errors": errors.to_list()
         }
     }
+    if snapshot:
+        result["folders_listed"] = snapshot.listed
+        result["folders_unchanged"] = snapshot.unchanged
+    return result
 
 def rename_image_files(folder_path, dry_run=True):
     """
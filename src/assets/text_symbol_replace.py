@@ -1,4 +1,5 @@
 import re
+from src.assets.transliterate import transliterate
 
 def clean_text_to_underscore(text):
     """
@@ -64,6 +65,23 @@ def clean_text_to_underscore_advanced(text):
     
     return cleaned
 
+def clean_text_to_underscore_transliterated(text):
+    """
+    Transliterate accented and non-Latin letters to ASCII, then clean the text.
+    Keeps names like "Привет мир" or "Café" meaningful instead of collapsing them to underscores.
+    
+    Args:
+        text (str): Input text to clean
+        
+    Returns:
+        str: Cleaned text with underscores replacing symbols and spaces
+        
+    Example:
+        Input: "Привет мир Café1"
+        Output: "privet_mir_cafe_1"
+    """
+    return clean_text_to_underscore(transliterate(text))
+
 # Example usage
 if __name__ == "__main__":
     # Test the function
@@ -94,3 +112,14 @@ if __name__ == "__main__":
     print("\nAdditional test cases:")
     for test in test_cases:
         print(f"'{test}' -> '{clean_text_to_underscore(test)}'")
+    
+    # Non-Latin test cases
+    unicode_cases = [
+        "Привет мир1",
+        "Café Crème",
+        "Ωμέγα Straße",
+    ]
+    
+    print("\nTransliterated test cases:")
+    for test in unicode_cases:
+        print(f"'{test}' -> '{clean_text_to_underscore_transliterated(test)}'")
@@ -0,0 +1,131 @@
+import functools
+import json
+import unicodedata
+
+# Romanization tables, lowercase only - uppercase entries are derived when the
+# translation table is built. Characters that decompose under NFKD (é, ñ, å...)
+# do not need entries: their accents are stripped after normalization.
+ROMANIZATION_TABLES = {
+    # Letters that have no NFKD decomposition to a plain Latin letter
+    "latin": {
+        "ß": "ss", "æ": "ae", "ø": "o", "đ": "d", "ł": "l", "þ": "th",
+        "ð": "d", "œ": "oe", "ı": "i", "ŋ": "ng", "ħ": "h", "ŧ": "t",
+    },
+    # Russian, Ukrainian, Belarusian and Bulgarian letters
+    "cyrillic": {
+        "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+        "ж": "zh", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+        "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+        "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+        "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+        "і": "i", "ї": "yi", "є": "ye", "ґ": "g", "ў": "u",
+    },
+    "greek": {
+        "α": "a", "β": "v", "γ": "g", "δ": "d", "ε": "e", "ζ": "z", "η": "i",
+        "θ": "th", "ι": "i", "κ": "k", "λ": "l", "μ": "m", "ν": "n", "ξ": "x",
+        "ο": "o", "π": "p", "ρ": "r", "σ": "s", "ς": "s", "τ": "t", "υ": "y",
+        "φ": "f", "χ": "ch", "ψ": "ps", "ω": "o",
+    },
+    # German umlaut spelling (ä -> ae) instead of plain accent stripping (ä -> a)
+    "german": {
+        "ä": "ae", "ö": "oe", "ü": "ue",
+    },
+}
+
+DEFAULT_TABLES = ("latin", "cyrillic", "greek")
+
+
+@functools.lru_cache(maxsize=1)
+def _combining_marks():
+    # Scanning the BMP once is enough: every combining mark that NFKD
+    # produces for letters in practical use lives below U+10000.
+    return {cp: None for cp in range(0x300, 0x10000) if unicodedata.combining(chr(cp))}
+
+
+@functools.lru_cache(maxsize=None)
+def get_translation_table(tables=DEFAULT_TABLES, custom_items=()):
+    """
+    Build (once per process) the str.translate map for a set of tables.
+
+    Args:
+        tables (tuple): Names of ROMANIZATION_TABLES entries, applied in order
+                        (later tables override earlier ones)
+        custom_items (tuple): Extra (character, replacement) pairs, applied last
+
+    Returns:
+        dict: Mapping of code point to replacement string or None
+    """
+    table = dict(_combining_marks())
+    for table_name in tables:
+        try:
+            mapping = ROMANIZATION_TABLES[table_name]
+        except KeyError:
+            raise ValueError(f"Unknown romanization table: {table_name}")
+        for char, replacement in mapping.items():
+            table[ord(char)] = replacement
+            upper = char.upper()
+            if len(upper) == 1 and upper != char:
+                table[ord(upper)] = replacement.capitalize()
+    for char, replacement in custom_items:
+        table[ord(char)] = replacement
+    return table
+
+
+def load_table(path):
+    """
+    Read a custom romanization table from a JSON file of {"char": "replacement"}.
+
+    Args:
+        path (str): Path to the JSON file
+
+    Returns:
+        tuple: (character, replacement) pairs usable as custom_items
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+    if not isinstance(mapping, dict) or not all(
+            isinstance(k, str) and len(k) == 1 and isinstance(v, str) for k, v in mapping.items()):
+        raise ValueError(f"Romanization table '{path}' must map single characters to strings")
+    return tuple(sorted(mapping.items()))
+
+
+def transliterate(text, tables=DEFAULT_TABLES, custom_items=()):
+    """
+    Convert accented and non-Latin letters to their closest ASCII spelling.
+
+    The text is translated once before NFKD (for precomposed letters with their
+    own spelling, e.g. й -> y) and once after it (for decomposed leftovers and
+    to drop the accents), so there is no per-character Python loop.
+
+    Args:
+        text (str): Input text
+        tables (tuple): Romanization tables to use (see ROMANIZATION_TABLES)
+        custom_items (tuple): Extra (character, replacement) pairs, see load_table
+
+    Returns:
+        str: Transliterated text; characters without a mapping (e.g. CJK) are kept
+
+    Example:
+        Input: "Café Привет Ωμέγα"
+        Output: "Cafe Privet Omega"
+    """
+    if text.isascii():
+        return text
+    table = get_translation_table(tuple(tables), tuple(custom_items))
+    return unicodedata.normalize("NFKD", text.translate(table)).translate(table)
+
+
+# Example usage
+if __name__ == "__main__":
+    test_cases = [
+        "Café Crème brûlée",
+        "Привет мир",
+        "Київ Їжак",
+        "Ωμέγα Αλφα",
+        "Straße Øresund Łódź",
+        "Ｆｕｌｌｗｉｄｔｈ ﬁle",
+        "北京 2023",
+    ]
+
+    for test in test_cases:
+        print(f"'{test}' -> '{transliterate(test)}'")
@@ -0,0 +1,292 @@
+import os
+import threading
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QComboBox, QLabel, QHeaderView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+
+STATUS_COLORS = {
+    "collision": QColor("#C77700"),
+    "error": QColor("#CC0000"),
+    "unchanged": QColor("#888888"),
+}
+
+FILTERS = {
+    "all": None,
+    "changes": ("rename",),
+    "collisions": ("collision",),
+    "errors": ("error",),
+    "problems": ("collision", "error"),
+}
+
+
+class PlanTableModel(QAbstractTableModel):
+    """
+    Table model over a streaming rename/copy plan.
+
+    Plan entries are pulled from the generator by a background thread, so
+    listing and planning a huge folder never freezes the window, and only as
+    far as the view has asked for (canFetchMore/fetchMore): previewing a
+    million-file plan costs the rows scrolled into view plus one batch. The
+    rows of a folder arrive once the whole folder is listed and planned,
+    since collisions can't be known before that. Rows are stored as plain
+    tuples and filtering works on an index list, not on copies of the rows.
+    """
+
+    COLUMNS = ("Original", "New Name", "Status")
+    scanned = pyqtSignal()
+    # Rows planned by the worker thread, and whether the plan is finished (queued to the GUI thread)
+    rows_planned = pyqtSignal(list, bool)
+
+    # Seconds the worker may hold planned rows before sending them
+    SEND_INTERVAL = 0.1
+
+    def __init__(self, plan, batch_size=500, parent=None):
+        super().__init__(parent)
+        self.plan = iter(plan)
+        self.batch_size = batch_size
+        self.rows = []          # (original name, new name, status, reason, folder)
+        self.visible = []       # indexes into self.rows for the current filter
+        self.statuses = None    # statuses shown, None for all
+        self.exhausted = False
+        self.counts = {"rename": 0, "unchanged": 0, "collision": 0, "error": 0}
+        self._continue_scheduled = False
+        self._fetching = False          # a fetchMore request is being planned
+        self._visible_before_fetch = 0
+        self._requested = 0             # plan entries the worker may pull, guarded by _demand
+        self._stopped = False
+        self._demand = threading.Condition()
+        self.rows_planned.connect(self._add_rows)
+        self._worker = threading.Thread(target=self._pull_plan, daemon=True)
+        self._worker.start()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        row = self.rows[self.visible[index.row()]]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 2:
+                return row[2] if not row[3] else f"{row[2]}: {row[3]}"
+            return row[column]
+        if role == Qt.ToolTipRole:
+            return os.path.join(row[4], row[column]) if column < 2 else row[3]
+        if role == Qt.ForegroundRole:
+            return STATUS_COLORS.get(row[2], QVariant())
+        return QVariant()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Ask the worker for the next batch_size plan entries; they arrive in _add_rows"""
+        self._continue_scheduled = False
+        if parent.isValid() or self.exhausted or self._fetching:
+            return
+        self._fetching = True
+        self._visible_before_fetch = len(self.visible)
+        with self._demand:
+            self._requested = len(self.rows) + self.batch_size
+            self._demand.notify()
+
+    def _pull_plan(self):
+        """Worker thread: plan entries up to the requested count and send them as rows"""
+        rows = []
+        pulled = 0
+        sent = time.monotonic()
+        while True:
+            if pulled >= self._requested:
+                # Request satisfied: hand over what is left and wait for the view to ask again
+                if rows and not self._send(rows, False):
+                    return
+                rows = []
+                with self._demand:
+                    while pulled >= self._requested and not self._stopped:
+                        self._demand.wait()
+                sent = time.monotonic()
+            if self._stopped:
+                return
+            try:
+                entry = next(self.plan)
+            except StopIteration:
+                self._send(rows, True)
+                return
+            except Exception as e:
+                # Shown as the last row rather than lost in the worker thread
+                rows.append(("", "", "error", f"Planning stopped: {e}", ""))
+                self._send(rows, True)
+                return
+            pulled += 1
+            status = entry["status"]
+            rows.append((
+                os.path.basename(entry["original"]),
+                os.path.basename(entry["new"]) if entry["new"] else "",
+                status,
+                entry["reason"] if status != "unchanged" else None,
+                os.path.dirname(entry["original"]),
+            ))
+            # A huge folder's rows come all at once; send them in pieces the view can take
+            if len(rows) >= self.batch_size or time.monotonic() - sent >= self.SEND_INTERVAL:
+                if not self._send(rows, False):
+                    return
+                rows = []
+                sent = time.monotonic()
+
+    def _send(self, rows, exhausted):
+        try:
+            self.rows_planned.emit(rows, exhausted)
+        except RuntimeError:
+            # The model was deleted with its window
+            return False
+        return True
+
+    def _add_rows(self, rows, exhausted):
+        """GUI thread: store rows planned by the worker and show those passing the filter"""
+        first_row = len(self.rows)
+        new_visible = []
+        for offset, row in enumerate(rows):
+            self.counts[row[2]] = self.counts.get(row[2], 0) + 1
+            if self.statuses is None or row[2] in self.statuses:
+                new_visible.append(first_row + offset)
+        self.rows.extend(rows)
+        self.exhausted = exhausted
+
+        if new_visible:
+            first = len(self.visible)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_visible) - 1)
+            self.visible.extend(new_visible)
+            self.endInsertRows()
+        if self._fetching and (exhausted or len(self.rows) >= self._requested):
+            self._fetching = False
+            if not exhausted and len(self.visible) == self._visible_before_fetch:
+                # A sparse filter got no visible row out of this batch; keep
+                # fetching from the event loop, the view won't ask again by itself
+                self._schedule_continue()
+        self.scanned.emit()
+
+    def close(self):
+        """Stop the worker thread; the rest of the plan is not pulled"""
+        with self._demand:
+            self._stopped = True
+            self._demand.notify()
+
+    def _schedule_continue(self):
+        if not self._continue_scheduled:
+            self._continue_scheduled = True
+            QTimer.singleShot(0, self.fetchMore)
+
+    def set_filter(self, statuses):
+        """
+        Show only rows with the given statuses.
+
+        Args:
+            statuses (tuple): Plan statuses to show, or None for all rows
+        """
+        self.beginResetModel()
+        self.statuses = statuses
+        self.visible = [i for i, row in enumerate(self.rows) if statuses is None or row[2] in statuses]
+        self._visible_before_fetch = len(self.visible)
+        self.endResetModel()
+        # A fetch in flight continues by itself if it finds nothing to show
+        if not self.visible and not self.exhausted and not self._fetching:
+            self._schedule_continue()
+
+
+class PreviewPane(QWidget):
+    """
+    Window showing the planned before -> after names, with a filter for collisions and errors.
+    """
+
+    def __init__(self, plan, parent=None):
+        super().__init__(parent)
+        self.model = PlanTableModel(plan, parent=self)
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowFlags(Qt.Window)
+        self.setWindowTitle("Rename Preview")
+        self.setStyleSheet("""
+            QWidget {
+                font-family: 'Arial';
+                background-color: white;
+            }
+            QComboBox {
+                background-color: #CDEBF0;
+                color: black;
+                font-weight: bold;
+                border: none;
+                border-radius: 8px;
+                padding: 8px;
+            }
+            QHeaderView::section {
+                background-color: #CDEBF0;
+                font-weight: bold;
+                border: none;
+                padding: 4px;
+            }
+        """)
+
+        self.filter_combo = QComboBox(self)
+        self.filter_combo.addItem("Show: All", "all")
+        self.filter_combo.addItem("Show: Renamed", "changes")
+        self.filter_combo.addItem("Show: Collisions", "collisions")
+        self.filter_combo.addItem("Show: Errors", "errors")
+        self.filter_combo.addItem("Show: Collisions + Errors", "problems")
+        self.filter_combo.currentIndexChanged.connect(self.on_filter_changed)
+
+        self.summary_label = QLabel(self)
+
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        # Fixed row height and no content-based sizing keep the view O(visible rows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(0, 260)
+        self.table.setColumnWidth(1, 260)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.filter_combo)
+        top_layout.addStretch()
+        top_layout.addWidget(self.summary_label)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(top_layout)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+        self.resize(820, 600)
+
+        self.model.scanned.connect(self.update_summary)
+        self.model.modelReset.connect(self.update_summary)
+        self.update_summary()
+
+    def closeEvent(self, event):
+        self.model.close()
+        super().closeEvent(event)
+
+    def on_filter_changed(self):
+        self.model.set_filter(FILTERS[self.filter_combo.currentData()])
+
+    def update_summary(self):
+        counts = self.model.counts
+        scanned = len(self.model.rows)
+        more = "" if self.model.exhausted else "+"
+        self.summary_label.setText(
+            f"{scanned}{more} files planned | {counts.get('rename', 0)} renamed | "
+            f"{counts.get('collision', 0)} collisions | {counts.get('error', 0)} errors"
+        )
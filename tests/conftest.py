@@ -0,0 +1,30 @@
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+CORPUS_PATH = os.path.join(ROOT, "tests", "golden", "corpus.ndjson.gz")
+
+
+def load_corpus(path=CORPUS_PATH):
+    """
+    Read the golden corpus.
+
+    Returns:
+        tuple: (column names, list of rows [input, expected output per cleaner...])
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        rows = [json.loads(line) for line in f]
+    return header["columns"], rows
+
+
+@pytest.fixture(scope="session")
+def golden_corpus():
+    return load_corpus()
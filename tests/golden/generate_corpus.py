@@ -0,0 +1,193 @@
+"""
+Build the golden filename corpus used by tests/test_golden_corpus.py.
+
+The names are generated deterministically (fixed seed) from real-world
+patterns - camera and scanner names, screenshots, office documents,
+downloads, music and video releases - mixed with unicode text and a list
+of hand-picked edge cases. Each line of the gzipped NDJSON output holds
+the input name and the expected output of every cleaner.
+
+Only regenerate the expected outputs when a naming change is intended:
+downstream systems key off these names.
+
+Usage:
+    python tests/golden/generate_corpus.py            # write corpus.ndjson.gz
+    python tests/golden/generate_corpus.py --check    # compare without writing
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from src.assets.text_symbol_replace import (
+    clean_text_to_underscore,
+    clean_text_to_underscore_advanced,
+    clean_text_to_underscore_transliterated,
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.ndjson.gz")
+CORPUS_SIZE = 250000
+SEED = 20240601
+
+# Cleaners covered by the corpus, in the column order of each line
+CLEANERS = {
+    "clean_text_to_underscore": clean_text_to_underscore,
+    "clean_text_to_underscore_advanced": clean_text_to_underscore_advanced,
+    "clean_text_to_underscore_transliterated": clean_text_to_underscore_transliterated,
+}
+
+WORDS = (
+    "report final draft invoice budget summary meeting notes photo vacation beach family party "
+    "wedding birthday project proposal contract scan receipt statement resume cover letter "
+    "presentation slides holiday trip summer winter spring autumn office home backup archive "
+    "export data sheet chapter episode season track album live remix edit version copy new old "
+    "client acme corp ltd inc team sales marketing hr it q1 q2 q3 q4 fy annual monthly weekly"
+).split()
+
+UNICODE_WORDS = (
+    "café crème résumé naïve façade jalapeño piñata señor über straße größe müller ærøskøbing "
+    "smörgåsbord łódź kraków český dvořák İstanbul ağaç привет мир документ отчёт фото "
+    "ωμέγα αλφα ελλάδα 東京 写真 報告書 사진 문서 مرحبا שלום नमस्ते ไทย ﬁnance ǅemal "
+    "Ⅻ ½ ² ℃ № ＡＢＣ １２３ ｶﾀｶﾅ 🎉 📷 👍🏽 ❤️ ★ ✓"
+).split()
+
+SEPARATORS = [" ", " ", " ", "_", "-", " - ", ".", ",", "  ", "__", "--", " & ", "+", "~", " ", "\t"]
+BRACKETS = [("(", ")"), ("[", "]"), ("{", "}"), ("<", ">"), ("'", "'"), ('"', '"'), ("«", "»")]
+SYMBOLS = "!@#$%^&*=;:?|\\/`"
+
+EDGE_CASES = [
+    "", " ", "   ", "_", "___", "-", ".", "...", "..", "a", "A", "1", "01", "a1", "1a", "A1B2C3",
+    "abc123def456", "ABC DEF", "  leading", "trailing  ", "__both__", "--dashes--",
+    "tab\there", "new\nline", "carriage\r\nreturn", "null\x00byte", "bell\x07", "nbsp\u00a0space",
+    "thin\u2009space", "ideographic\u3000space", "zero\u200bwidth", "joiner\u200dzwj", "bom\ufeffmark",
+    "soft\u00adhyphen", "rtl\u200fmark", "e\u0301 combining", "n\u0303", "\u0301leading mark",
+    "İstanbul", "ǅ titlecase", "ß sharp", "ﬁ ligature", "Ⅻ roman", "x²", "½ half", "１２３ fullwidth",
+    "ＡＢＣ fullwidth", "🎉", "📷 photo 1", "👍🏽 tone", "❤️ heart", "a🎉b", "CON", "nul", "COM1", "LPT9",
+    "aux.txt", "con.tar", "a" * 300, "ü" * 200, "1" * 100, "Ab" * 150, "x y " * 60,
+    "400 million years ago, it was the ocean, and 400 million years later, it is the desert1",
+    "Hello, World! How are you?", "File@Name#123$%^&*()", "Multiple    spaces   here",
+    "Special@#$%Characters!!!", "Numbers123 and Text456", "My Vacation Photo (2023)",
+    "Document@#$%Final", "A Bite of the Moon1", "SOLO EXHIBITION- Hotel Smoke and Ash2",
+    "The Cambrian Period5", "Привет мир1", "Café Crème", "Ωμέγα Straße",
+]
+
+
+def _word(rng):
+    word = rng.choice(WORDS) if rng.random() < 0.85 else rng.choice(UNICODE_WORDS)
+    style = rng.random()
+    if style < 0.3:
+        return word.capitalize()
+    if style < 0.4:
+        return word.upper()
+    return word
+
+
+def _date(rng):
+    year, month, day = rng.randint(1998, 2030), rng.randint(1, 12), rng.randint(1, 28)
+    return rng.choice([
+        f"{year}-{month:02d}-{day:02d}", f"{year}{month:02d}{day:02d}", f"{day:02d}.{month:02d}.{year}",
+        f"{month}/{day}/{year}", f"{year}_{month:02d}_{day:02d}",
+    ])
+
+
+def _time(rng):
+    hour, minute, second = rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59)
+    return rng.choice([f"{hour:02d}.{minute:02d}.{second:02d}", f"{hour:02d}{minute:02d}{second:02d}",
+                       f"{hour}.{minute:02d}.{second:02d} PM"])
+
+
+def _phrase(rng, low=1, high=6):
+    parts = [_word(rng) for _ in range(rng.randint(low, high))]
+    name = parts[0]
+    for part in parts[1:]:
+        name += rng.choice(SEPARATORS) + part
+    return name
+
+
+def _bracketed(rng):
+    opening, closing = rng.choice(BRACKETS)
+    return opening + _phrase(rng, 1, 3) + closing
+
+
+TEMPLATES = [
+    lambda rng: f"IMG_{rng.randint(0, 9999):04d}",
+    lambda rng: f"DSC{rng.randint(0, 99999):05d}",
+    lambda rng: f"DSCN{rng.randint(0, 9999):04d}",
+    lambda rng: f"PXL_{_date(rng).replace('-', '')}_{rng.randint(0, 999999999):09d}",
+    lambda rng: f"Screenshot {_date(rng)} at {_time(rng)}",
+    lambda rng: f"Screen Shot {_date(rng)} at {_time(rng)}",
+    lambda rng: f"WhatsApp Image {_date(rng)} at {_time(rng)}",
+    lambda rng: f"Scan {_date(rng)} ({rng.randint(1, 20)})",
+    lambda rng: f"{_phrase(rng, 1, 4)} ({rng.randint(1, 9)})",
+    lambda rng: f"{_phrase(rng, 1, 4)} - Copy",
+    lambda rng: f"{_phrase(rng, 1, 4)} - Copy ({rng.randint(2, 5)})",
+    lambda rng: f"Copy of {_phrase(rng, 1, 4)}",
+    lambda rng: f"{_phrase(rng, 1, 3)} v{rng.randint(1, 12)}",
+    lambda rng: f"{_phrase(rng, 1, 3)}_v{rng.randint(1, 3)}.{rng.randint(0, 9)}",
+    lambda rng: f"{_phrase(rng, 1, 3)} FINAL{rng.choice(['', ' FINAL', '_final2', ' (approved)'])}",
+    lambda rng: f"{rng.choice(['Invoice', 'Rechnung', 'Facture', 'Счёт'])} #{rng.randint(1, 99999)} - "
+                f"{_phrase(rng, 1, 2)}",
+    lambda rng: f"{_date(rng)} {_phrase(rng, 1, 4)}",
+    lambda rng: f"{_phrase(rng, 1, 3)} {_date(rng)}",
+    lambda rng: f"{rng.randint(1, 30):02d} - {_phrase(rng, 1, 4)}",
+    lambda rng: f"{_phrase(rng, 1, 2)} - {_phrase(rng, 1, 4)} ({rng.randint(1960, 2030)})",
+    lambda rng: f"{_phrase(rng, 1, 3)}.S{rng.randint(1, 12):02d}E{rng.randint(1, 24):02d}.{rng.choice(['720p', '1080p', '2160p'])}",
+    lambda rng: "".join(w.capitalize() for w in rng.sample(WORDS, rng.randint(2, 4))) + str(rng.randint(0, 99)),
+    lambda rng: "_".join(rng.sample(WORDS, rng.randint(2, 5))).upper(),
+    lambda rng: _phrase(rng, 2, 8),
+    lambda rng: _phrase(rng, 1, 3) + "".join(rng.choice(SYMBOLS) for _ in range(rng.randint(1, 4))) + _phrase(rng, 1, 2),
+    lambda rng: _bracketed(rng) + " " + _phrase(rng, 1, 2),
+    lambda rng: " ".join(rng.choice(UNICODE_WORDS) for _ in range(rng.randint(1, 4))) + str(rng.randint(0, 9)),
+    lambda rng: rng.choice(SEPARATORS).join([_phrase(rng, 1, 2), str(rng.randint(0, 10 ** rng.randint(1, 8)))]),
+]
+
+
+def generate_names(size=CORPUS_SIZE, seed=SEED):
+    """Edge cases first, then size - len(EDGE_CASES) generated names"""
+    rng = random.Random(seed)
+    names = list(EDGE_CASES)
+    while len(names) < size:
+        name = rng.choice(TEMPLATES)(rng)
+        if rng.random() < 0.05:
+            # Stray whitespace and punctuation around the name, as pasted from elsewhere
+            name = rng.choice(["", " ", "  ", "_", "-", ".", "'"]) + name + rng.choice(["", " ", "_", ".", "!", " "])
+        names.append(name)
+    return names
+
+
+def build_rows(names):
+    return [[name, *(cleaner(name) for cleaner in CLEANERS.values())] for name in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="compare the current cleaners with the corpus")
+    args = parser.parse_args()
+
+    rows = build_rows(generate_names())
+    if args.check:
+        with gzip.open(CORPUS_PATH, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            stored = [json.loads(line) for line in f]
+        changed = sum(1 for old, new in zip(stored, rows) if old != new)
+        print(f"{len(rows)} names, {changed} differ from {CORPUS_PATH} (columns: {header['columns']})")
+        return 1 if changed or len(stored) != len(rows) else 0
+
+    # mtime=0 keeps the file byte-identical between runs
+    with open(CORPUS_PATH, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as compressed:
+        with io.TextIOWrapper(compressed, encoding="utf-8", newline="\n") as f:
+            f.write(json.dumps({"columns": ["input", *CLEANERS], "seed": SEED, "size": len(rows)}) + "\n")
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    print(f"Wrote {len(rows)} names to {CORPUS_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import io
+import os
+import posixpath
+import tarfile
+import zipfile
+
+import pytest
+
+from src.assets.archive_rename import rename_archive_members, find_and_rename_archives
+
+
+def _make_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(zipfile.ZipInfo("docs/"), b"")
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def _add_tar_file(archive, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    archive.addfile(info, io.BytesIO(data))
+
+
+def test_zip_members_are_renamed_and_keep_their_data(tmp_path):
+    source = tmp_path / "bundle.zip"
+    _make_zip(source, {
+        "docs/My File.txt": b"mine",
+        "docs/my_file.txt": b"already clean",
+        "Photo 1.JPG": b"jpeg",
+    })
+
+    result = rename_archive_members(str(source), dry_run=False)
+    assert result["renamed"] == 1
+    assert result["errors"] == 0
+    with zipfile.ZipFile(result["output"]) as archive:
+        assert sorted(archive.namelist()) == ["docs/", "docs/My File.txt", "docs/my_file.txt", "photo_1.JPG"]
+        assert archive.read("photo_1.JPG") == b"jpeg"
+        assert archive.read("docs/my_file.txt") == b"already clean"
+    # The member already using the clean name wins; the other one is skipped
+    assert [item["path"] for item in result["details"]["skipped_files"]
+            if "already" in item["reason"]] == ["docs/My File.txt"]
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    source = tmp_path / "bundle.zip"
+    _make_zip(source, {"Photo 1.JPG": b"jpeg"})
+    result = rename_archive_members(str(source), dry_run=True)
+    assert result["renamed"] == 1
+    assert result["output"] is None
+    assert not (tmp_path / "bundle_renamed.zip").exists()
+
+
+@pytest.mark.parametrize("compression", ["", "gz", "xz"])
+def test_tar_links_follow_renamed_members(tmp_path, compression):
+    source = tmp_path / ("bundle.tar" + (f".{compression}" if compression else ""))
+    with tarfile.open(source, "w:" + compression) as archive:
+        _add_tar_file(archive, "./docs/My File.txt", b"mine")
+        symlink = tarfile.TarInfo("docs/Link To File")
+        symlink.type = tarfile.SYMTYPE
+        symlink.linkname = "My File.txt"
+        archive.addfile(symlink)
+        hardlink = tarfile.TarInfo("other/Hard Link.txt")
+        hardlink.type = tarfile.LNKTYPE
+        hardlink.linkname = "docs/My File.txt"
+        archive.addfile(hardlink)
+
+    result = rename_archive_members(str(source), dry_run=False, in_place=True)
+    assert result["output"] == str(source)
+    with tarfile.open(source) as archive:
+        members = {member.name: member for member in archive.getmembers()}
+        # Only regular files are renamed; links keep their names and point at the new ones
+        assert set(members) == {"./docs/my_file.txt", "docs/Link To File", "other/Hard Link.txt"}
+        assert members["docs/Link To File"].linkname == "my_file.txt"
+        assert posixpath.normpath(members["other/Hard Link.txt"].linkname) == "docs/my_file.txt"
+        assert archive.extractfile("./docs/my_file.txt").read() == b"mine"
+        if os.name == "nt":
+            # Creating symlinks needs extra privileges on Windows
+            return
+        archive.extractall(tmp_path / "out")
+    assert (tmp_path / "out" / "other" / "Hard Link.txt").read_bytes() == b"mine"
+    assert os.readlink(tmp_path / "out" / "docs" / "Link To File") == "my_file.txt"
+
+
+def test_second_pass_renames_nothing(tmp_path):
+    _make_zip(tmp_path / "a.zip", {"@@@.txt": b"1", "CON.txt": b"2", "Name 1.txt": b"3"})
+    with tarfile.open(tmp_path / "b.tar.gz", "w:gz") as archive:
+        _add_tar_file(archive, "北京.png", b"4")
+        _add_tar_file(archive, "A" * 300 + ".pdf", b"5")
+
+    first = find_and_rename_archives(str(tmp_path), dry_run=False)
+    assert first["renamed"] == 5
+    assert first["fallbacks"] == 4
+    before = {path.name: os.stat(path) for path in tmp_path.iterdir()}
+    second = find_and_rename_archives(str(tmp_path), dry_run=False)
+    assert second["renamed"] == 0
+    # Clean archives aren't rewritten
+    assert [result["output"] for result in second["archives"]] == [None, None]
+    for path in tmp_path.iterdir():
+        assert os.path.samestat(os.stat(path), before[path.name])
+        assert os.stat(path).st_mtime_ns == before[path.name].st_mtime_ns
@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+import pytest
+
+from src.assets.chunked_copy import copy_file_chunked, file_checksum
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.bin"
+    path.write_bytes(os.urandom(100000))
+    return path
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_copy_hashes_the_data_it_writes(source, tmp_path, use_mmap):
+    destination = tmp_path / "copy.bin"
+    progress = []
+    digest = copy_file_chunked(str(source), str(destination), buffer_size=16384, use_mmap=use_mmap,
+                               checksum="sha256", verify=True, progress=progress.append)
+
+    assert destination.read_bytes() == source.read_bytes()
+    assert digest == hashlib.sha256(source.read_bytes()).hexdigest()
+    assert sum(progress) == 100000
+    assert max(progress) <= 16384
+    assert os.stat(destination).st_mtime_ns == os.stat(source).st_mtime_ns
+
+
+def test_no_checksum_returns_none(source, tmp_path):
+    assert copy_file_chunked(str(source), str(tmp_path / "copy.bin")) is None
+
+
+def test_limiter_is_charged_per_chunk(source, tmp_path):
+    charged = []
+
+    class Limiter:
+        def acquire_bytes(self, amount):
+            charged.append(amount)
+            return 0
+
+    copy_file_chunked(str(source), str(tmp_path / "copy.bin"), buffer_size=32768, limiter=Limiter())
+    assert sum(charged) == 100000
+    assert len(charged) == 4
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_failed_copy_leaves_no_partial_file(source, tmp_path, use_mmap):
+    destination = tmp_path / "copy.bin"
+
+    def disk_full(amount):
+        raise OSError(28, "No space left on device")
+
+    with pytest.raises(OSError):
+        copy_file_chunked(str(source), str(destination), buffer_size=16384, use_mmap=use_mmap, progress=disk_full)
+    assert not destination.exists()
+
+
+def test_file_checksum_matches_hashlib(source):
+    assert file_checksum(str(source), "md5", buffer_size=4096) == hashlib.md5(source.read_bytes()).hexdigest()
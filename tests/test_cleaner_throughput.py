@@ -0,0 +1,112 @@
+"""
+Throughput gate for the filename cleaners.
+
+Each cleaner's names/second is measured on a slice of the golden corpus
+(best of several rounds, like pytest-benchmark's min) and divided by the
+speed of a fixed calibration workload run on the same machine, so the
+stored baseline holds across faster and slower machines. The test fails
+when a cleaner falls more than the tolerance below its baseline.
+
+Environment:
+    NAMEREFINER_THROUGHPUT_TOLERANCE  allowed slowdown, default 0.3 (30%)
+    NAMEREFINER_SKIP_THROUGHPUT=1     skip the gate (e.g. on a loaded CI runner)
+
+Refresh the baseline after an intended speed change:
+    python tests/test_cleaner_throughput.py --update-baseline
+"""
+import json
+import os
+import re
+import sys
+import time
+
+import pytest
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.assets.text_symbol_replace import (
+    clean_text_to_underscore,
+    clean_text_to_underscore_advanced,
+    clean_text_to_underscore_transliterated,
+)
+from src.assets.naming_rules import get_cleaner
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "throughput_baseline.json")
+SAMPLE_SIZE = 20000
+ROUNDS = 5
+DEFAULT_TOLERANCE = 0.3
+
+CLEANERS = {
+    "clean_text_to_underscore": clean_text_to_underscore,
+    "clean_text_to_underscore_advanced": clean_text_to_underscore_advanced,
+    "clean_text_to_underscore_transliterated": clean_text_to_underscore_transliterated,
+    "profile:default": get_cleaner(None),
+    "profile:transliterate": get_cleaner("transliterate"),
+}
+
+_CALIBRATION_PATTERN = re.compile(r"[^a-z0-9]+")
+_CALIBRATION_NAMES = [f"Calibration Name {i} - Copy ({i % 7}).v{i % 3}" for i in range(SAMPLE_SIZE)]
+
+
+def _calibrate(name):
+    return _CALIBRATION_PATTERN.sub("_", name.lower()).strip("_")
+
+
+def names_per_second(function, names, rounds=ROUNDS):
+    """Best-of-rounds throughput of function over names"""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for name in names:
+            function(name)
+        best = min(best, time.perf_counter() - started)
+    return len(names) / best
+
+
+def relative_speeds(names):
+    """names/second of each cleaner divided by the calibration workload's names/second"""
+    calibration = names_per_second(_calibrate, _CALIBRATION_NAMES)
+    return {case: names_per_second(cleaner, names) / calibration for case, cleaner in CLEANERS.items()}
+
+
+def sample_names(rows):
+    # Every n-th name, so the sample keeps the corpus' mix of patterns
+    step = max(1, len(rows) // SAMPLE_SIZE)
+    return [row[0] for row in rows[::step][:SAMPLE_SIZE]]
+
+
+@pytest.mark.skipif(os.environ.get("NAMEREFINER_SKIP_THROUGHPUT") == "1", reason="throughput gate disabled")
+def test_cleaner_throughput_has_not_regressed(golden_corpus):
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)["relative_speed"]
+    tolerance = float(os.environ.get("NAMEREFINER_THROUGHPUT_TOLERANCE", DEFAULT_TOLERANCE))
+
+    speeds = relative_speeds(sample_names(golden_corpus[1]))
+    regressions = [
+        f"  {case}: {speeds[case]:.3f} vs baseline {baseline[case]:.3f} "
+        f"({(1 - speeds[case] / baseline[case]) * 100:.0f}% slower)"
+        for case in CLEANERS
+        if case in baseline and speeds[case] < baseline[case] * (1 - tolerance)
+    ]
+    missing = [case for case in CLEANERS if case not in baseline]
+    assert not missing, f"No baseline for {missing}; run this file with --update-baseline"
+    assert not regressions, "Cleaner throughput regressed beyond {:.0%}:\n{}".format(tolerance, "\n".join(regressions))
+
+
+def update_baseline():
+    from conftest import load_corpus
+    speeds = relative_speeds(sample_names(load_corpus()[1]))
+    with open(BASELINE_PATH, "w", encoding="utf-8", newline="\n") as f:
+        json.dump({"sample_size": SAMPLE_SIZE, "relative_speed": {k: round(v, 4) for k, v in speeds.items()}},
+                  f, indent=2)
+        f.write("\n")
+    for case, speed in speeds.items():
+        print(f"{case}: {speed:.3f}x calibration speed")
+
+
+if __name__ == "__main__":
+    if "--update-baseline" in sys.argv:
+        update_baseline()
+    else:
+        print(__doc__)
@@ -0,0 +1,66 @@
+import os
+
+from src.assets import dedup
+from src.assets.dedup import find_duplicates, HashCache
+from src.assets.error_report import ErrorCollector
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_only_same_size_files_are_hashed(tmp_path, monkeypatch):
+    first = _write(tmp_path / "a.bin", b"same content")
+    second = _write(tmp_path / "b.bin", b"same content")
+    other = _write(tmp_path / "c.bin", b"same length!")
+    unique = _write(tmp_path / "d.bin", b"a different size")
+
+    hashed = []
+    real_hash = dedup.hash_file
+    monkeypatch.setattr(dedup, "hash_file", lambda path: hashed.append(path) or real_hash(path))
+
+    duplicates = find_duplicates([first, second, other, unique], cache_path=None)
+    assert duplicates == {second: first}
+    assert sorted(hashed) == sorted([first, second, other])
+
+
+def test_cache_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.db")
+    first = _write(tmp_path / "a.bin", b"x" * 100)
+    second = _write(tmp_path / "b.bin", b"x" * 100)
+
+    hashed = []
+    real_hash = dedup.hash_file
+    monkeypatch.setattr(dedup, "hash_file", lambda path: hashed.append(path) or real_hash(path))
+
+    assert find_duplicates([first, second], cache_path) == {second: first}
+    assert len(hashed) == 2
+
+    hashed.clear()
+    assert find_duplicates([first, second], cache_path) == {second: first}
+    assert hashed == []
+
+    # Same size, new content and mtime: only the edited file is hashed again
+    _write(tmp_path / "b.bin", b"y" * 100)
+    os.utime(second, ns=(1, 1))
+    assert find_duplicates([first, second], cache_path) == {}
+    assert hashed == [second]
+
+
+def test_cache_entry_needs_matching_size_and_mtime(tmp_path):
+    cache = HashCache(str(tmp_path / "cache.db"))
+    cache.put("/data/a.bin", 10, 1000, "digest")
+    cache.save()
+    assert cache.get("/data/a.bin", 10, 1000) == "digest"
+    assert cache.get("/data/a.bin", 10, 2000) is None
+    assert cache.get("/data/a.bin", 11, 1000) is None
+    cache.close()
+
+
+def test_unreadable_files_are_reported_and_treated_as_unique(tmp_path):
+    errors = ErrorCollector(verbose=False)
+    first = _write(tmp_path / "a.bin", b"same")
+    missing = str(tmp_path / "gone.bin")
+    assert find_duplicates([first, missing], cache_path=None, errors=errors) == {}
+    assert len(errors) == 1
@@ -0,0 +1,161 @@
+import errno
+import os
+
+import pytest
+
+from src.assets import error_report, file_filter
+from src.assets.error_report import ErrorCollector, ErrorRecord, categorize, is_transient, with_retry
+from src.assets.file_filter import FileFilter
+from src.assets.folder_copy import copy_and_rename_files
+from src.assets.subfolder_file_rename import find_and_rename_files
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr(error_report.time, "sleep", delays.append)
+    return delays
+
+
+def test_transient_errors_are_retried_with_backoff(no_sleep):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise OSError(errno.EBUSY, "Device or resource busy")
+        return "done"
+
+    assert with_retry(flaky, delay=0.5) == "done"
+    assert no_sleep == [0.5, 1.0]
+
+
+def test_permanent_errors_are_raised_at_once(no_sleep):
+    calls = []
+
+    def denied():
+        calls.append(1)
+        raise PermissionError(errno.EACCES, "Permission denied")
+
+    with pytest.raises(PermissionError):
+        with_retry(denied)
+    assert len(calls) == 1
+    assert no_sleep == []
+
+
+def test_retries_give_up_after_the_last_attempt(no_sleep):
+    with pytest.raises(TimeoutError):
+        with_retry(lambda: (_ for _ in ()).throw(TimeoutError()), attempts=4)
+    assert len(no_sleep) == 3
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (OSError(errno.EBUSY, "busy"), True),
+    (TimeoutError(), True),
+    (OSError(errno.ENOENT, "missing"), False),
+    (ValueError("bad"), False),
+])
+def test_is_transient(exc, expected):
+    assert is_transient(exc) == expected
+
+
+@pytest.mark.parametrize("error_number, category", [
+    (errno.EACCES, "permission"),
+    (errno.ENOSPC, "disk_full"),
+    (errno.ENAMETOOLONG, "invalid_name"),
+    (errno.EBUSY, "busy"),
+    (None, "other"),
+])
+def test_categorize(error_number, category):
+    assert categorize(ErrorRecord("f", error_number, "copy", "message")) == category
+
+
+def test_collector_keeps_a_bounded_report(capsys):
+    errors = ErrorCollector(max_records=3, print_limit=2)
+    for i in range(10):
+        errors.add(f"file{i}", PermissionError(errno.EACCES, "Permission denied"), "copy")
+    errors.add("other", "Name clash", "plan")
+
+    assert len(errors) == 11
+    assert errors.counts == {"permission": 10, "other": 1}
+    assert len(errors.to_list()) == 4
+    assert errors.report(examples=1).splitlines() == [
+        "11 errors:",
+        "  permission: 10",
+        "    - [copy] file0: [Errno 13] Permission denied",
+        "  other: 1",
+        "    - [plan] other: Name clash",
+    ]
+    assert capsys.readouterr().out.count("ERROR") == 4
+
+
+@pytest.fixture
+def locked():
+    """Set to False to make the "locked" folder readable again"""
+    return [True]
+
+
+@pytest.fixture
+def tree_with_unreadable_folder(tmp_path, monkeypatch, locked):
+    root = tmp_path / "in"
+    for path in ["A File.txt", "locked/B File.txt", "open/C File.txt"]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_bytes(b"x")
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if locked[0] and os.path.basename(path) == "locked":
+            raise PermissionError(errno.EACCES, "Permission denied", path)
+        return real_scandir(path)
+
+    # Walks call os.scandir through the module attribute; this replaces it for all of them
+    monkeypatch.setattr(file_filter.os, "scandir", scandir)
+    return root
+
+
+def test_walk_records_unreadable_folders(tree_with_unreadable_folder):
+    errors = ErrorCollector(verbose=False)
+    found = FileFilter(extensions=None).iter_files(tree_with_unreadable_folder, errors=errors)
+    assert sorted(path.name for path in found) == ["A File.txt", "C File.txt"]
+    assert [(record["stage"], record["category"]) for record in errors.to_list()] == [("scan", "permission")]
+    assert errors.to_list()[0]["path"] == str(tree_with_unreadable_folder / "locked")
+
+
+def test_walk_retries_a_busy_folder(tmp_path, monkeypatch, no_sleep):
+    (tmp_path / "a.txt").write_bytes(b"x")
+    real_scandir = os.scandir
+    failures = [OSError(errno.EBUSY, "busy")]
+
+    def scandir(path):
+        if failures:
+            raise failures.pop()
+        return real_scandir(path)
+
+    monkeypatch.setattr(file_filter.os, "scandir", scandir)
+    errors = ErrorCollector(verbose=False)
+    assert [path.name for path in FileFilter().iter_files(tmp_path, errors=errors)] == ["a.txt"]
+    assert len(errors) == 0
+
+
+def test_engines_report_missed_folders(tree_with_unreadable_folder, tmp_path):
+    result = find_and_rename_files(str(tree_with_unreadable_folder), dry_run=True)
+    assert result["renamed"] == 2
+    assert result["error_counts"] == {"permission": 1}
+
+    result = copy_and_rename_files(str(tree_with_unreadable_folder), str(tmp_path / "out"))
+    assert result["copied"] == 2
+    assert [record["stage"] for record in result["details"]["errors"]] == ["scan"]
+
+
+def test_incremental_run_lists_a_missed_folder_again(tree_with_unreadable_folder, tmp_path, locked):
+    snapshot_path = str(tmp_path / "snapshot.db")
+    first = find_and_rename_files(str(tree_with_unreadable_folder), dry_run=False, incremental=True,
+                                  snapshot_path=snapshot_path)
+    assert first["renamed"] == 2
+    assert first["errors"] == 1
+
+    locked[0] = False
+    second = find_and_rename_files(str(tree_with_unreadable_folder), dry_run=False, incremental=True,
+                                   snapshot_path=snapshot_path)
+    assert second["renamed"] == 1
+    assert (tree_with_unreadable_folder / "locked" / "b_file.txt").exists()
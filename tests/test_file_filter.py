@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from src.assets import file_filter
+from src.assets.file_filter import FileFilter, parse_patterns, DEFAULT_EXCLUDES
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for path in ["a.txt", "b.TXT", "c.tmp", "README", "bundle.tar.gz",
+                 "node_modules/pkg/index.js", "src/main.py", "src/cache/x/thumbs/t.jpg", "src/cache/x/keep.jpg",
+                 ".git/HEAD"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_bytes(b"x")
+    return tmp_path
+
+
+def _relative(root, paths):
+    return sorted(path.relative_to(root).as_posix() for path in paths)
+
+
+def test_extensions_are_matched_case_insensitively(tree):
+    found = FileFilter(extensions=["TXT", ".tar.gz"], exclude=DEFAULT_EXCLUDES).iter_files(tree)
+    assert _relative(tree, found) == ["a.txt", "b.TXT", "bundle.tar.gz"]
+
+
+def test_all_files_without_extension_filter(tree):
+    found = FileFilter(extensions=None, exclude=["node_modules", ".git", "src"]).iter_files(tree)
+    assert _relative(tree, found) == ["README", "a.txt", "b.TXT", "bundle.tar.gz", "c.tmp"]
+
+
+def test_include_patterns(tree):
+    found = FileFilter(extensions=None, include=["*.py", "src/cache/*/keep.jpg"]).iter_files(tree)
+    assert _relative(tree, found) == ["src/cache/x/keep.jpg", "src/main.py"]
+
+
+def test_exclude_names_and_paths(tree):
+    found = FileFilter(extensions=None, exclude=["*.tmp", "src/cache/*/thumbs", ".git", "node_modules"]).iter_files(tree)
+    assert _relative(tree, found) == ["README", "a.txt", "b.TXT", "bundle.tar.gz", "src/cache/x/keep.jpg",
+                                      "src/main.py"]
+
+
+def test_excluded_folders_are_never_opened(tree, monkeypatch):
+    opened = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        opened.append(os.path.relpath(path, tree).replace(os.sep, "/"))
+        return real_scandir(path)
+
+    monkeypatch.setattr(file_filter.os, "scandir", scandir)
+    list(FileFilter(exclude=["node_modules", "src/cache"]).iter_files(tree))
+    assert sorted(opened) == [".", ".git", "src"]
+
+
+def test_non_recursive_walk(tree):
+    assert _relative(tree, FileFilter(extensions=[".py", ".txt"]).iter_files(tree, recursive=False)) == ["a.txt", "b.TXT"]
+
+
+def test_listings_hold_every_name(tree):
+    listings = {}
+    list(FileFilter(extensions=[".py"]).iter_entries(tree, listings=listings))
+    assert listings[str(tree / "src")] == {"main.py", "cache"}
+    assert "c.tmp" in listings[str(tree)]
+
+
+def test_parse_patterns():
+    assert parse_patterns(" .git, node_modules,, *.tmp ,") == [".git", "node_modules", "*.tmp"]
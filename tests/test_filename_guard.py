@@ -0,0 +1,53 @@
+import pytest
+
+from src.assets.filename_guard import safe_filename, MAX_NAME_BYTES
+from src.assets.naming_rules import get_cleaner
+from src.assets.subfolder_file_rename import find_and_rename_files
+
+PROFILES = [
+    None,
+    "keep_case",
+    "transliterate",
+    "kebab",
+    {"name": "slashes", "rules": [{"type": "regex", "pattern": " ", "replacement": "/"}]},
+    {"name": "keep_symbols", "rules": [{"type": "collapse_symbols", "keep": ":?. "}]},
+    {"name": "shout", "rules": [{"type": "uppercase"}, {"type": "collapse_symbols"}]},
+]
+
+# Names that need a fallback under at least one profile
+NAMES = ["@@@", "___", "CON", "nul", "北京", "a" * 300, "ü" * 200, "a b", "x:y?. ", "abc. ", "Name 1"]
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=lambda p: p["name"] if isinstance(p, dict) else str(p))
+def test_fallback_names_are_stable(profile):
+    cleaner = get_cleaner(profile)
+    for name in NAMES:
+        filename, _ = safe_filename(cleaner(name), name, ".txt", MAX_NAME_BYTES, cleaner)
+        stem = filename[:-len(".txt")]
+        again, _ = safe_filename(cleaner(stem), stem, ".txt", MAX_NAME_BYTES, cleaner)
+        assert again == filename, f"{name!r} -> {filename!r} -> {again!r}"
+
+
+@pytest.mark.parametrize("cleaned, extension, expected", [
+    ("a/b", ".txt", "a_b.txt"),
+    ("a\\b", ".txt", "a_b.txt"),
+    ("a:b?", ".txt", "a_b_.txt"),
+    ("nul\x00byte", ".txt", "nul_byte.txt"),
+    ("abc. ", "", "abc"),
+    ("name", ".tx t ", "name.tx t"),
+])
+def test_invalid_characters_are_replaced(cleaned, extension, expected):
+    assert safe_filename(cleaned, cleaned, extension) == (expected, "invalid_chars")
+
+
+def test_second_run_renames_nothing(tmp_path):
+    # "A1" * 100 fits, but separate_digits makes the cleaned name too long
+    for name in ("@@@.jpg", "CON.txt", "北京.png", "A1" * 100 + ".pdf", "My Photo 2.jpg"):
+        (tmp_path / name).write_bytes(b"x")
+
+    first = find_and_rename_files(str(tmp_path), None, dry_run=False)
+    assert first["renamed"] == 5
+    assert first["fallbacks"] == 4
+    second = find_and_rename_files(str(tmp_path), None, dry_run=False)
+    assert second["renamed"] == 0
+    assert second["skipped"] == 5
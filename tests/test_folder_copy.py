@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from src.assets import chunked_copy, folder_copy
+from src.assets.folder_copy import copy_and_rename_files
+
+
+def test_file_keeping_its_name_wins_over_a_renamed_one(tmp_path):
+    source, output = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "A B.txt").write_text("renamed")
+    (source / "a_b.txt").write_text("kept")
+
+    result = copy_and_rename_files(str(source), str(output))
+    assert (output / "a_b.txt").read_text() == "kept"
+    assert [item["path"] for item in result["details"]["skipped_files"]] == [str(source / "A B.txt")]
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="needs hardlinks")
+def test_rerun_does_not_write_through_hardlinks(tmp_path):
+    source, output = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "One.txt").write_text("same")
+    (source / "Two.txt").write_text("same")
+    copy_and_rename_files(str(source), str(output), dedup="hardlink", hash_cache_path=None)
+
+    (source / "Two.txt").write_text("changed")
+    copy_and_rename_files(str(source), str(output), dedup="hardlink", hash_cache_path=None)
+    assert (output / "one.txt").read_text() == "same"
+    assert (output / "two.txt").read_text() == "changed"
+
+
+def test_unverified_copy_is_removed(tmp_path, monkeypatch):
+    source, output = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "Data.bin").write_bytes(os.urandom(4096))
+    monkeypatch.setattr(chunked_copy, "file_checksum", lambda *args, **kwargs: "0" * 64)
+
+    result = copy_and_rename_files(str(source), str(output), checksum="sha256", verify=True)
+    assert result["copied"] == 0
+    assert result["details"]["errors"][0]["stage"] == "verify"
+    assert not (output / "data.bin").exists()
+
+
+def test_byte_progress_moves_inside_large_files_only(tmp_path, monkeypatch):
+    source, output = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "big.bin").write_bytes(os.urandom(64 * 1024))
+    (source / "small.bin").write_bytes(b"x" * 100)
+    monkeypatch.setattr(folder_copy, "CHUNKED_PROGRESS_THRESHOLD", 1024)
+
+    chunked = []
+    real_copy = folder_copy.copy_file_chunked
+
+    def copy_in_chunks(source_path, destination, *args, **kwargs):
+        chunked.append(os.path.basename(source_path))
+        return real_copy(source_path, destination, 16 * 1024, *args[1:], **kwargs)
+
+    monkeypatch.setattr(folder_copy, "copy_file_chunked", copy_in_chunks)
+    reports = []
+    result = copy_and_rename_files(str(source), str(output), byte_progress_callback=lambda done, total: reports.append((done, total)))
+
+    assert result["copied"] == 2
+    assert chunked == ["big.bin"]
+    assert reports[-1] == (64 * 1024 + 100, 64 * 1024 + 100)
+    assert (output / "big.bin").read_bytes() == (source / "big.bin").read_bytes()
+
+
+def test_plain_copy_without_progress_uses_copy2(tmp_path, monkeypatch):
+    source, output = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "big.bin").write_bytes(b"x" * 4096)
+    monkeypatch.setattr(folder_copy, "CHUNKED_PROGRESS_THRESHOLD", 1024)
+    monkeypatch.setattr(folder_copy, "copy_file_chunked", lambda *args, **kwargs: pytest.fail("chunked copy used"))
+    assert copy_and_rename_files(str(source), str(output))["copied"] == 1
+
+
+def test_file_grown_after_the_walk_is_copied_whole(tmp_path):
+    source, output = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "growing.bin").write_bytes(b"x" * 10)
+    data = os.urandom(10000)
+
+    def grow(stage, done, total):
+        # The walk has recorded 10 bytes by now
+        (source / "growing.bin").write_bytes(data)
+
+    result = copy_and_rename_files(str(source), str(output), verify=True, use_mmap=True, buffer_size=4096,
+                                   scan_callback=grow)
+    assert result["copied"] == 1
+    assert (output / "growing.bin").read_bytes() == data
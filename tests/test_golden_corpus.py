@@ -0,0 +1,49 @@
+import pytest
+
+from src.assets.text_symbol_replace import (
+    clean_text_to_underscore,
+    clean_text_to_underscore_advanced,
+    clean_text_to_underscore_transliterated,
+)
+from src.assets.naming_rules import get_cleaner
+
+# Cleaner under test -> corpus column holding its expected output. The built-in
+# profiles promise the same names as the functions they replace.
+CASES = {
+    "clean_text_to_underscore": (clean_text_to_underscore, "clean_text_to_underscore"),
+    "clean_text_to_underscore_advanced": (clean_text_to_underscore_advanced, "clean_text_to_underscore_advanced"),
+    "clean_text_to_underscore_transliterated": (
+        clean_text_to_underscore_transliterated, "clean_text_to_underscore_transliterated"),
+    "profile:default": (get_cleaner(None), "clean_text_to_underscore"),
+    "profile:transliterate": (get_cleaner("transliterate"), "clean_text_to_underscore_transliterated"),
+}
+
+MAX_REPORTED = 20
+
+
+def test_corpus_is_large_and_varied(golden_corpus):
+    _, rows = golden_corpus
+    inputs = [row[0] for row in rows]
+    assert len(inputs) >= 200000
+    assert "" in inputs
+    assert any(not name.isascii() for name in inputs)
+    assert any(len(name) > 255 for name in inputs)
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_cleaner_matches_golden_corpus(golden_corpus, case):
+    columns, rows = golden_corpus
+    cleaner, column = CASES[case]
+    index = columns.index(column)
+
+    mismatches = []
+    for row in rows:
+        actual = cleaner(row[0])
+        if actual != row[index]:
+            mismatches.append((row[0], row[index], actual))
+
+    if mismatches:
+        lines = [f"{len(mismatches)} of {len(rows)} names changed for {case}:"]
+        lines += [f"  {name!r}: expected {expected!r}, got {actual!r}"
+                  for name, expected, actual in mismatches[:MAX_REPORTED]]
+        pytest.fail("\n".join(lines))
@@ -0,0 +1,97 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.assets import io_throttle
+from src.assets.file_filter import FileStat
+from src.assets.io_throttle import TokenBucket, IOLimiter, AdaptiveConcurrency, order_for_locality
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time for the throttle module: sleeping advances the clock"""
+    clock = SimpleNamespace(now=100.0, slept=[])
+
+    def sleep(seconds):
+        clock.slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(io_throttle, "time", SimpleNamespace(monotonic=lambda: clock.now, sleep=sleep))
+    return clock
+
+
+def test_bucket_allows_a_burst_then_holds_the_rate(clock):
+    bucket = TokenBucket(rate=100, capacity=50)
+    assert bucket.consume(50) == 0
+    assert bucket.consume(25) == pytest.approx(0.25)
+    clock.now += 1.0
+    # Refilled to capacity, not beyond
+    assert bucket.consume(50) == 0
+    assert bucket.consume(1) == pytest.approx(0.01)
+
+
+def test_oversized_request_puts_the_bucket_in_debt(clock):
+    bucket = TokenBucket(rate=10)
+    assert bucket.consume(30) == pytest.approx(2.0)
+    assert bucket.consume(10) == pytest.approx(1.0)
+    assert sum(clock.slept) == pytest.approx(3.0)
+
+
+def test_limiter_without_limits_never_waits(clock):
+    limiter = IOLimiter()
+    limiter.acquire_operation()
+    assert limiter.acquire_bytes(10 ** 12) == 0
+    assert clock.slept == []
+
+
+def test_limiter_charges_bytes_and_operations(clock):
+    limiter = IOLimiter(bytes_per_second=1000, iops=2)
+    assert limiter.acquire_bytes(3000) == pytest.approx(2.0)
+    assert limiter.acquire_bytes(0) == 0
+    for _ in range(3):
+        limiter.acquire_operation()
+    assert clock.slept == [pytest.approx(2.0), pytest.approx(0.5)]
+
+
+def _window(controller, seconds_per_byte, size=1024 * 1024):
+    for _ in range(controller.window):
+        controller.record(seconds_per_byte * size, size)
+
+
+def test_concurrency_grows_while_latency_holds():
+    controller = AdaptiveConcurrency(max_workers=6, window=4)
+    assert controller.limit == 3
+    _window(controller, 1e-9)
+    assert controller.limit == 3  # first window sets the baseline
+    for expected in (4, 5, 6, 6):
+        _window(controller, 1e-9)
+        assert controller.limit == expected
+
+
+def test_concurrency_halves_when_storage_queues():
+    controller = AdaptiveConcurrency(max_workers=8, min_workers=2, window=4)
+    _window(controller, 1e-9)
+    _window(controller, 1e-9)
+    assert controller.limit == 5
+    _window(controller, 1e-7)
+    assert controller.limit == 2
+    _window(controller, 1e-7)
+    assert controller.limit == 2  # never below min_workers
+
+
+def test_tiny_files_count_as_one_small_operation():
+    controller = AdaptiveConcurrency(max_workers=4, window=1)
+    controller.record(0.001, 10)
+    assert controller.ewma == pytest.approx(0.001 / AdaptiveConcurrency.MIN_COST_BYTES)
+
+
+def test_locality_order():
+    paths = [os.path.join("b", "x"), os.path.join("a", "z"), os.path.join("a", "y")]
+    assert order_for_locality(paths) == [os.path.join("a", "y"), os.path.join("a", "z"), os.path.join("b", "x")]
+    stats = {path: FileStat(1, 0, ino, 0) for path, ino in zip(paths, (1, 5, 3))}
+    assert order_for_locality(paths, by_inode=True, stats=stats) == [
+        os.path.join("a", "y"), os.path.join("a", "z"), os.path.join("b", "x")
+    ]
+    stats[os.path.join("a", "y")] = FileStat(1, 0, 9, 0)
+    assert order_for_locality(paths, by_inode=True, stats=stats)[:2] == [os.path.join("a", "z"), os.path.join("a", "y")]
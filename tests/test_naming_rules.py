@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+from src.assets.naming_rules import get_cleaner, compile_rules, load_profile, NamingProfileError, BUILTIN_PROFILES
+from src.assets.text_symbol_replace import clean_text_to_underscore
+
+EXAMPLE_PROFILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "static", "profiles", "example_profile.toml")
+
+
+def _clean(rule, text):
+    return compile_rules([rule])(text)
+
+
+@pytest.mark.parametrize("rule, text, expected", [
+    ({"type": "lowercase"}, "My File", "my file"),
+    ({"type": "uppercase"}, "My File", "MY FILE"),
+    ({"type": "separate_digits"}, "track1 b22", "track_1 b_22"),
+    ({"type": "separate_digits", "separator": "\\"}, "a1", "a\\1"),
+    ({"type": "strip_prefix", "prefixes": ["IMG", "IMG_"]}, "img_1234", "1234"),
+    ({"type": "strip_prefix", "prefixes": "DSC_", "ignore_case": False}, "dsc_1", "dsc_1"),
+    ({"type": "regex", "pattern": r"(\w+)-(\w+)", "replacement": r"\2-\1"}, "a-b", "b-a"),
+    ({"type": "regex", "pattern": "copy", "flags": ["ignorecase"]}, "File COPY", "File "),
+    ({"type": "normalize_dates"}, "Scan 05.01.2023 and 2023_01_06", "Scan 2023-01-05 and 2023-01-06"),
+    ({"type": "normalize_dates", "separator": ""}, "20230105 32.01.2023", "20230105 32.01.2023"),
+    ({"type": "normalize_dates", "separator": "_"}, "2023-12-31", "2023_12_31"),
+    ({"type": "transliterate"}, "Ærøskøbing Москва", "Aeroskobing Moskva"),
+    ({"type": "transliterate", "tables": "cyrillic"}, "Ærø Москва", "Ærø Moskva"),
+    ({"type": "collapse_symbols"}, "  a -- b!c  ", "a_b_c"),
+    ({"type": "collapse_symbols", "separator": "-", "keep": "."}, "v1.2 (final)", "v1.2-final"),
+    ({"type": "collapse_symbols", "keep_unicode": True}, "北京 photo_1", "北京_photo_1"),
+    ({"type": "max_length", "length": 6}, "abcde_fgh", "abcde"),
+    ({"type": "max_length", "length": 3, "strip": ""}, "ab_cd", "ab_"),
+])
+def test_rule(rule, text, expected):
+    assert _clean(rule, text) == expected
+
+
+def test_rules_run_in_order():
+    cleaner = get_cleaner({"name": "custom", "rules": [
+        {"type": "strip_prefix", "prefixes": ["IMG_"]},
+        {"type": "normalize_dates"},
+        {"type": "collapse_symbols", "separator": "-", "keep": "-"},
+        {"type": "max_length", "length": 20},
+    ]})
+    assert cleaner("IMG_Holiday 05.01.2023 (beach)") == "Holiday-2023-01-05-b"
+    assert cleaner.profile_name == "custom"
+
+
+@pytest.mark.parametrize("text", ["400 million years ago, it was the ocean1", "IMG_My Photo (2023)", "", "__a__"])
+def test_default_profile_matches_clean_text_to_underscore(text):
+    assert get_cleaner()(text) == clean_text_to_underscore(text)
+
+
+def test_builtin_profiles_compile_once():
+    for name in BUILTIN_PROFILES:
+        assert get_cleaner(name) is get_cleaner(name)
+
+
+def test_profile_files_load(tmp_path):
+    assert get_cleaner(EXAMPLE_PROFILE)("Some File 1")
+    path = tmp_path / "shout.json"
+    path.write_text(json.dumps({"rules": [{"type": "uppercase"}, {"type": "collapse_symbols"}]}), encoding="utf-8")
+    assert load_profile(str(path))["name"] == "shout"
+    assert get_cleaner(str(path))("a b") == "A_B"
+
+
+@pytest.mark.parametrize("profile", [
+    {"name": 5, "rules": []},
+    {"rules": {"type": "lowercase"}},
+    {"rules": ["lowercase"]},
+    {"rules": [{"type": "titlecase"}]},
+    {"rules": [{"type": "separate_digits", "separator": 1}]},
+    {"rules": [{"type": "strip_prefix"}]},
+    {"rules": [{"type": "strip_prefix", "prefixes": [1]}]},
+    {"rules": [{"type": "strip_prefix", "prefixes": ["a"], "ignore_case": "no"}]},
+    {"rules": [{"type": "regex"}]},
+    {"rules": [{"type": "regex", "pattern": 5}]},
+    {"rules": [{"type": "regex", "pattern": "("}]},
+    {"rules": [{"type": "regex", "pattern": "a", "flags": ["nosuchflag"]}]},
+    {"rules": [{"type": "regex", "pattern": "a", "replacement": 1}]},
+    {"rules": [{"type": "regex", "pattern": "a", "replacement": r"\1"}]},
+    {"rules": [{"type": "normalize_dates", "separator": 1}]},
+    {"rules": [{"type": "transliterate", "tables": 5}]},
+    {"rules": [{"type": "transliterate", "tables": ["klingon"]}]},
+    {"rules": [{"type": "transliterate", "custom_table": "no_such_table.json"}]},
+    {"rules": [{"type": "collapse_symbols", "separator": 1}]},
+    {"rules": [{"type": "collapse_symbols", "keep": 5}]},
+    {"rules": [{"type": "collapse_symbols", "keep_unicode": "yes"}]},
+    {"rules": [{"type": "max_length", "length": True}]},
+    {"rules": [{"type": "max_length", "length": 0}]},
+    {"rules": [{"type": "max_length", "length": 5, "strip": 0}]},
+])
+def test_invalid_profiles_are_refused_when_compiled(profile):
+    with pytest.raises(NamingProfileError):
+        get_cleaner(profile)
+
+
+def test_missing_profile_file():
+    with pytest.raises(NamingProfileError):
+        get_cleaner("no_such_profile.toml")
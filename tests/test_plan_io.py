@@ -0,0 +1,137 @@
+import gzip
+import json
+import shutil
+
+import pytest
+
+from src.assets.plan_io import export_plan, apply_plan
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    (root / "sub").mkdir(parents=True)
+    (root / "My Photo.jpg").write_bytes(b"photo")
+    (root / "sub" / "Report Final.pdf").write_bytes(b"report")
+    (root / "sub" / "clean.txt").write_bytes(b"clean")
+    return root
+
+
+def _mirror(root, tmp_path):
+    # copytree keeps mtimes, like a mirror made with rsync -a
+    mirror = tmp_path / "mirror"
+    shutil.copytree(root, mirror)
+    return mirror
+
+
+def test_plan_made_on_a_mirror_applies_to_the_original(tree, tmp_path):
+    mirror = _mirror(tree, tmp_path)
+    plan_path = tmp_path / "plan.ndjson.gz"
+    exported = export_plan(str(mirror), str(plan_path))
+    assert exported["planned"] == 2
+
+    # Nothing is renamed while planning
+    assert (mirror / "My Photo.jpg").exists()
+
+    result = apply_plan(str(plan_path), root_folder=str(tree), dry_run=False)
+    assert result["complete"]
+    assert result["renamed"] == 2
+    assert result["errors"] == 0
+    assert sorted(p.name for p in tree.rglob("*") if p.is_file()) == ["clean.txt", "my_photo.jpg", "report_final.pdf"]
+
+
+def test_dry_run_renames_nothing(tree, tmp_path):
+    plan_path = tmp_path / "plan.ndjson"
+    export_plan(str(tree), str(plan_path))
+    result = apply_plan(str(plan_path), dry_run=True)
+    assert result["renamed"] == 2
+    assert (tree / "My Photo.jpg").exists()
+
+
+def test_files_changed_since_planning_are_skipped(tree, tmp_path):
+    plan_path = tmp_path / "plan.ndjson"
+    export_plan(str(tree), str(plan_path))
+    (tree / "My Photo.jpg").write_bytes(b"edited photo")
+
+    result = apply_plan(str(plan_path), dry_run=False)
+    assert result["renamed"] == 1
+    reasons = {item["reason"] for item in result["details"]["skipped_files"]}
+    assert "Changed since planning" in reasons
+    assert (tree / "My Photo.jpg").exists()
+
+
+def test_target_taken_since_planning_is_skipped(tree, tmp_path):
+    plan_path = tmp_path / "plan.ndjson"
+    export_plan(str(tree), str(plan_path))
+    (tree / "my_photo.jpg").write_bytes(b"someone else")
+
+    result = apply_plan(str(plan_path), dry_run=False)
+    assert result["renamed"] == 1
+    assert (tree / "my_photo.jpg").read_bytes() == b"someone else"
+    assert (tree / "My Photo.jpg").read_bytes() == b"photo"
+
+
+def test_missing_file_is_an_error(tree, tmp_path):
+    plan_path = tmp_path / "plan.ndjson"
+    export_plan(str(tree), str(plan_path))
+    (tree / "My Photo.jpg").unlink()
+
+    result = apply_plan(str(plan_path), dry_run=False)
+    assert result["renamed"] == 1
+    assert result["errors"] == 1
+
+
+@pytest.mark.parametrize("name", ["plan.ndjson", "plan.ndjson.gz"])
+def test_truncated_plan_is_reported_incomplete(tree, tmp_path, name):
+    plan_path = tmp_path / name
+    export_plan(str(tree), str(plan_path))
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(plan_path, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+
+    # Keep the header and the first entry, then cut the second entry in half
+    with opener(plan_path, "wb") as f:
+        f.write(b"".join(lines[:2]) + lines[2][:len(lines[2]) // 2])
+    if name.endswith(".gz"):
+        # And cut the compressed stream itself, as an interrupted transfer would
+        data = plan_path.read_bytes()
+        plan_path.write_bytes(data[:len(data) - 4])
+
+    result = apply_plan(str(plan_path), dry_run=True)
+    assert not result["complete"]
+    assert result["total_files"] == 1
+    assert any(record["stage"] == "plan" for record in result["details"]["errors"])
+
+
+def test_paths_leaving_the_root_are_refused(tree, tmp_path):
+    plan_path = tmp_path / "plan.ndjson"
+    outside = tmp_path / "Outside File.txt"
+    outside.write_bytes(b"x")
+    with open(plan_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"format": "namerefiner-plan", "version": 1, "root": str(tree)}) + "\n")
+        f.write(json.dumps({"path": "../Outside File.txt", "status": "rename", "new": "outside_file.txt",
+                            "size": 1}) + "\n")
+        f.write(json.dumps({"end": True}) + "\n")
+
+    result = apply_plan(str(plan_path), dry_run=False)
+    assert result["renamed"] == 0
+    assert result["errors"] == 1
+    assert outside.exists()
+
+
+@pytest.mark.parametrize("bad_line", [
+    {"path": "My Photo.jpg", "new": "my_photo.jpg", "size": 5},
+    {"path": "My Photo.jpg", "status": 5},
+    [1, 2],
+])
+def test_malformed_lines_are_plan_errors(tree, tmp_path, bad_line):
+    plan_path = tmp_path / "plan.ndjson"
+    with open(plan_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"format": "namerefiner-plan", "version": 1, "root": str(tree)}) + "\n")
+        f.write(json.dumps(bad_line) + "\n")
+        f.write(json.dumps({"end": True}) + "\n")
+
+    result = apply_plan(str(plan_path), dry_run=True)
+    assert result["complete"]
+    assert result["renamed"] == 0
+    assert [record["stage"] for record in result["details"]["errors"]] == ["plan"]
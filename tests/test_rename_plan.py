@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+from src.assets.file_filter import FileFilter
+from src.assets.naming_rules import get_cleaner
+from src.assets.subfolder_file_rename import iter_rename_plan
+
+
+def _statuses(plan):
+    return {os.path.basename(entry["original"]): entry["status"] for entry in plan}
+
+
+def test_targets_differing_in_case_collide_when_case_is_ignored(tmp_path):
+    files = [tmp_path / "A B.txt", tmp_path / "a b.txt"]
+    cleaner = get_cleaner("keep_case")
+
+    plan = list(iter_rename_plan(files, cleaner, listings={str(tmp_path): {"A B.txt", "a b.txt"}}, ignore_case=True))
+    assert sorted(_statuses(plan).values()) == ["collision", "rename"]
+
+    plan = list(iter_rename_plan(files, cleaner, listings={str(tmp_path): {"A B.txt", "a b.txt"}}, ignore_case=False))
+    assert sorted(_statuses(plan).values()) == ["rename", "rename"]
+
+
+def test_existing_targets_are_looked_up_in_the_listing(tmp_path):
+    # Nothing exists on disk: only the listing can report the target as taken
+    listings = {str(tmp_path): {"My File.txt", "MY_FILE.TXT", "Other.txt"}}
+    plan = list(iter_rename_plan([tmp_path / "My File.txt", tmp_path / "Other.txt"], get_cleaner(None),
+                                 listings=listings, ignore_case=True))
+    assert _statuses(plan) == {"My File.txt": "collision", "Other.txt": "rename"}
+
+    plan = list(iter_rename_plan([tmp_path / "My File.txt"], get_cleaner(None), listings=listings, ignore_case=False))
+    assert _statuses(plan) == {"My File.txt": "rename"}
+
+
+def test_walk_stats_travel_with_the_plan(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "Some File.txt").write_bytes(b"12345")
+    (tmp_path / "sub" / "Other File.txt").write_bytes(b"1")
+    listings = {}
+    entries = FileFilter().iter_entries(tmp_path, listings=listings)
+    plan = list(iter_rename_plan(entries, get_cleaner(None), listings=listings))
+
+    assert {os.path.basename(entry["original"]): entry["stat"].size for entry in plan} == {
+        "Some File.txt": 5, "Other File.txt": 1
+    }
+    assert listings[str(tmp_path)] == {"Some File.txt", "sub"}
+    assert all(Path(entry["new"]).parent == Path(entry["original"]).parent for entry in plan)
@@ -0,0 +1,115 @@
+import os
+import time
+
+from src.assets.subfolder_file_rename import find_and_rename_files
+
+# Fixed, so aging a folder twice leaves its mtime as the snapshot saw it
+PAST_NS = 1600000000 * 1000 * 1000 * 1000
+
+
+def _age(root):
+    """Move every folder's mtime out of the racy window, as if the tree was made a while ago"""
+    for folder, _, _ in os.walk(root):
+        os.utime(folder, ns=(PAST_NS, PAST_NS))
+
+
+def _run(root, snapshot_path, dry_run=False, **kwargs):
+    return find_and_rename_files(str(root), [".txt"], dry_run=dry_run, incremental=True,
+                                 snapshot_path=str(snapshot_path), **kwargs)
+
+
+def _make_tree(root):
+    for relative in ("keep.txt", "a/one.txt", "b/two.txt"):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative)
+    _age(root)
+
+
+def test_unchanged_folders_are_not_listed_again(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    _make_tree(root)
+
+    first = _run(root, snapshot)
+    assert first["folders_listed"] == 3
+    assert first["total_files"] == 3
+
+    second = _run(root, snapshot)
+    assert second["folders_listed"] == 0
+    assert second["folders_unchanged"] == 3
+    assert second["total_files"] == 0
+
+
+def test_changed_folder_is_listed_and_only_new_files_planned(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    _make_tree(root)
+    _run(root, snapshot)
+
+    (root / "a" / "New File.txt").write_text("new")
+    result = _run(root, snapshot)
+    assert result["folders_listed"] == 1
+    assert result["total_files"] == 1
+    assert result["renamed"] == 1
+    assert (root / "a" / "new_file.txt").exists()
+
+
+def test_folder_with_own_renames_is_listed_again(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    _make_tree(root)
+    (root / "a" / "Other File.txt").write_text("x")
+    _age(root)
+    assert _run(root, snapshot)["renamed"] == 1
+
+    # The rename changed the folder's mtime; even once it is old, the folder isn't trusted
+    _age(root)
+    result = _run(root, snapshot)
+    assert result["folders_listed"] == 1
+    assert result["total_files"] == 0
+
+    assert _run(root, snapshot)["folders_listed"] == 0
+
+
+def test_racy_folders_are_listed_again(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    _make_tree(root)
+    now = time.time_ns()
+    os.utime(root / "a", ns=(now, now))
+
+    _run(root, snapshot)
+    # "a" was modified right before it was listed, so a same-tick change could be missed
+    assert _run(root, snapshot)["folders_listed"] == 1
+
+    _age(root)
+    _run(root, snapshot)
+    assert _run(root, snapshot)["folders_listed"] == 0
+
+
+def test_dry_run_leaves_the_snapshot_alone(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    _make_tree(root)
+    _run(root, snapshot, dry_run=True)
+    assert _run(root, snapshot)["folders_listed"] == 3
+
+
+def test_changed_settings_trigger_a_full_scan(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    _make_tree(root)
+    _run(root, snapshot)
+    assert _run(root, snapshot, naming_profile="kebab")["folders_listed"] == 3
+
+
+def test_collision_is_planned_again_once_the_target_is_gone(tmp_path):
+    root, snapshot = tmp_path / "tree", tmp_path / "snapshot.db"
+    root.mkdir()
+    (root / "My File.txt").write_text("a")
+    (root / "my_file.txt").write_text("b")
+    _age(root)
+
+    first = _run(root, snapshot)
+    assert first["renamed"] == 0
+
+    (root / "my_file.txt").unlink()
+    second = _run(root, snapshot)
+    assert second["total_files"] == 1
+    assert second["renamed"] == 1
+    assert os.listdir(root) == ["my_file.txt"]
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from src.assets.transliterate import transliterate, get_translation_table, load_table
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Café Crème brûlée", "Cafe Creme brulee"),
+    ("Привет мир", "Privet mir"),
+    ("Київ Їжак", "Kiyiv Yizhak"),
+    ("Щука ЁЖ", "Shchuka YoZh"),
+    ("Ωμέγα Αλφα", "Omega Alfa"),
+    ("Straße Øresund Łódź", "Strasse Oresund Lodz"),
+    ("Ｆｕｌｌｗｉｄｔｈ ﬁle", "Fullwidth file"),
+    ("北京 2023", "北京 2023"),
+])
+def test_default_tables(text, expected):
+    assert transliterate(text) == expected
+
+
+def test_ascii_text_is_returned_as_is():
+    text = "already plain"
+    assert transliterate(text, tables=("no_such_table",)) is text
+
+
+def test_later_tables_override_earlier_ones():
+    assert transliterate("Müller") == "Muller"
+    assert transliterate("Müller", tables=("latin", "german")) == "Mueller"
+    assert transliterate("ÄÖÜ", tables=("german",)) == "AeOeUe"
+
+
+def test_unknown_table():
+    with pytest.raises(ValueError):
+        get_translation_table(("klingon",))
+
+
+def test_custom_table_is_applied_last(tmp_path):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps({"ø": "oe", "北": "bei"}), encoding="utf-8")
+    items = load_table(str(path))
+    # Custom entries are taken as written: no uppercase variant is derived
+    assert transliterate("øre Øre 北", custom_items=items) == "oere Ore bei"
+
+
+@pytest.mark.parametrize("mapping", [["a"], {"ab": "x"}, {"a": 5}])
+def test_malformed_custom_table(tmp_path, mapping):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(mapping), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_table(str(path))